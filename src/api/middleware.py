@@ -1,11 +1,13 @@
 """Middleware for request tracking and monitoring."""
 
+import gzip
+import itertools
+import os
 import time
-import uuid
-from typing import Callable
+from collections import deque
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from structlog.contextvars import bind_contextvars, clear_contextvars
 
 from src.core.logging import request_logger, get_logger
@@ -13,63 +15,115 @@ from src.core.logging import request_logger, get_logger
 
 logger = get_logger(__name__)
 
+# Response header names, encoded once
+REQUEST_ID_HEADER = b"x-request-id"
+RESPONSE_TIME_HEADER = b"x-response-time-ms"
 
-class RequestTracingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request tracing and logging."""
+# Health, docs and schema endpoints: cheap, frequently polled, never slow
+CHEAP_PATHS = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json"})
+
+# Bounded pool of per-request state dicts so bursts don't grow it unbounded
+_state_pool: deque = deque(maxlen=1024)
+
+# Request IDs are a random per-process prefix plus a monotonic counter;
+# unique enough for tracing without a CSPRNG call per request
+_worker_id = os.urandom(4).hex()
+_request_counter = itertools.count()
+
+
+def generate_request_id() -> str:
+    """Generate a request ID unique within this process.
+    
+    Returns:
+        16 hex characters: an 8-char worker prefix and an 8-char counter
+    """
+    return f"{_worker_id}{next(_request_counter):08x}"
+
+
+class RequestTracingMiddleware:
+    """Pure-ASGI middleware for request tracing and logging."""
+    
+    def __init__(self, app: ASGIApp, exclude_paths: frozenset = CHEAP_PATHS):
+        """Initialize tracing middleware.
+        
+        Args:
+            app: The ASGI application to wrap
+            exclude_paths: Paths that are passed through without tracing
+        """
+        self.app = app
+        self.exclude_paths = exclude_paths
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and add tracing."""
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = Headers(scope=scope)
+        
         # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = headers.get("x-request-id") or generate_request_id()
+        request_id_header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
         
         # Bind request ID to context for structured logging
         clear_contextvars()
         bind_contextvars(request_id=request_id)
         
-        # Store request ID in request state
-        request.state.request_id = request_id
+        # Store request ID in request state, reusing a pooled state dict
+        state = _state_pool.pop() if _state_pool else {}
+        state.update(scope.get("state", ()))
+        state["request_id"] = request_id
+        scope["state"] = state
+        
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        status_code = 500
         
         # Start timing
         start_time = time.time()
         
         # Log request
         request_logger.log_request(
-            method=request.method,
-            path=request.url.path,
+            method=method,
+            path=path,
             request_id=request_id,
-            client_host=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent"),
+            client_host=client[0] if client else None,
+            user_agent=headers.get("user-agent"),
         )
         
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            await send(message)
+        
         try:
             # Process request
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
             
             # Calculate duration
             duration_ms = (time.time() - start_time) * 1000
             
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
             # Log response
             request_logger.log_response(
-                method=request.method,
-                path=request.url.path,
+                method=method,
+                path=path,
                 request_id=request_id,
-                status_code=response.status_code,
+                status_code=status_code,
                 duration_ms=duration_ms,
             )
             
-            return response
-            
         except Exception as e:
             # Calculate duration
             duration_ms = (time.time() - start_time) * 1000
             
             # Log error
             request_logger.log_error(
-                method=request.method,
-                path=request.url.path,
+                method=method,
+                path=path,
                 request_id=request_id,
                 error=e,
                 duration_ms=duration_ms,
@@ -77,40 +131,141 @@ class RequestTracingMiddleware(BaseHTTPMiddleware):
             
             # Re-raise the exception
             raise
+        else:
+            # The app (including background tasks) is done with the state.
+            # On errors it is not recycled: the outer server error handler
+            # still reads request_id from it.
+            state.clear()
+            _state_pool.append(state)
         finally:
             # Clear context
             clear_contextvars()
 
 
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
-    """Middleware for performance monitoring."""
+class PerformanceMonitoringMiddleware:
+    """Pure-ASGI middleware for performance monitoring."""
     
-    def __init__(self, app, threshold_ms: float = 5000):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        threshold_ms: float = 5000,
+        exclude_paths: frozenset = CHEAP_PATHS,
+    ):
+        """Initialize performance monitoring middleware.
+        
+        Args:
+            app: The ASGI application to wrap
+            threshold_ms: Duration above which a request is logged as slow
+            exclude_paths: Paths that are never timed
+        """
+        self.app = app
         self.threshold_ms = threshold_ms
+        self.exclude_paths = exclude_paths
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Monitor request performance."""
-        start_time = time.time()
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
         
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Log slow requests
-        if duration_ms > self.threshold_ms:
-            logger.warning(
-                "slow_request_detected",
-                method=request.method,
-                path=request.url.path,
-                duration_ms=round(duration_ms, 2),
-                threshold_ms=self.threshold_ms,
-                request_id=getattr(request.state, "request_id", None),
-            )
+        start_time = time.perf_counter()
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate duration
+                duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+                
+                # Log slow requests
+                if duration_ms > self.threshold_ms:
+                    logger.warning(
+                        "slow_request_detected",
+                        method=scope["method"],
+                        path=scope["path"],
+                        duration_ms=duration_ms,
+                        threshold_ms=self.threshold_ms,
+                        request_id=scope.get("state", {}).get("request_id"),
+                    )
+                
+                # Add performance headers
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (RESPONSE_TIME_HEADER, str(duration_ms).encode("latin-1")),
+                ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+
+class CompressionMiddleware:
+    """Pure-ASGI middleware that gzips only large response bodies."""
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 1,
+        exclude_paths: frozenset = frozenset({"/", "/health"}),
+    ):
+        """Initialize compression middleware.
+        
+        Args:
+            app: The ASGI application to wrap
+            minimum_size: Smallest body size (bytes) worth compressing
+            compresslevel: gzip level; 1 is nearly free and still shrinks JSON well
+            exclude_paths: Paths that are never compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.exclude_paths = exclude_paths
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress the response if the client accepts gzip and it is large enough."""
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        if "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
         
-        # Add performance headers
-        response.headers["X-Response-Time-ms"] = str(round(duration_ms, 2))
+        start_message: Message = {}
+        passthrough = False
+        body_parts: list[bytes] = []
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_length = headers.get("content-length")
+                # Already encoded or known to be small: don't buffer at all
+                passthrough = "content-encoding" in headers or (
+                    content_length is not None
+                    and int(content_length) < self.minimum_size
+                )
+                if passthrough:
+                    await send(message)
+                return
+            
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            
+            body = b"".join(body_parts)
+            if len(body) >= self.minimum_size:
+                body = gzip.compress(body, compresslevel=self.compresslevel)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
         
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send_wrapper)
\ No newline at end of file
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.api.dependencies import get_request_id, verify_api_key
 from src.core.logging import get_logger
-from src.models import ModelInfo, ModelListResponse
+from src.models import ModelInfo, ModelListResponse, ModelRecord
 from src.services import model_service
 
 logger = get_logger(__name__)
@@ -99,7 +99,7 @@ async def get_model(
     model_id: str,
     api_key: Optional[str] = Depends(verify_api_key),
     request_id: Optional[str] = Depends(get_request_id),
-) -> ModelInfo:
+) -> ModelRecord:
     """
     Get information about a specific model.
     
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.responses import ORJSONResponse
 
 from src.api.dependencies import get_request_id, verify_api_key
 from src.core.error_handler import error_handler, with_error_handling
@@ -15,7 +16,7 @@ from src.core.exceptions import (
     UnsupportedParameterError,
 )
 from src.core.logging import get_logger
-from src.models import TranscriptionRequest, TranscriptionResponse
+from src.models import FIXED_USAGE_DICT, TranscriptionRequest, TranscriptionResponse
 from src.services import transcription_service
 
 logger = get_logger(__name__)
@@ -108,7 +109,7 @@ async def transcribe_audio(
     stream: Optional[bool] = Form(default=False),
     api_key: Optional[str] = Depends(verify_api_key),
     request_id: Optional[str] = Depends(get_request_id),
-) -> TranscriptionResponse:
+) -> ORJSONResponse:
     """
     Transcribe audio file to text.
     
@@ -189,7 +190,7 @@ async def transcribe_audio(
     
     # Use transcription service to handle the entire workflow
     try:
-        return await transcription_service.transcribe_audio(
+        result = await transcription_service.transcribe_audio(
             file_content=content,
             filename=file.filename,
             request=request,
@@ -213,4 +214,7 @@ async def transcribe_audio(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=error_handler.format_error_response(e, request_id=request_id)
-        )
\ No newline at end of file
+        )
+    
+    # Usage is fixed, so serialize directly instead of re-validating the model
+    return ORJSONResponse({"text": result.text, "usage": FIXED_USAGE_DICT})
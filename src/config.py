@@ -27,6 +27,15 @@ class Settings(BaseSettings):
         ge=1,
         le=65535,
     )
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        description="Maximum concurrent connections before the server responds with 503. None for no limit.",
+        gt=0,
+    )
+    pin_cpus: Optional[list[int]] = Field(
+        default=None,
+        description="CPU cores to pin the server process to (e.g., [0, 1, 2, 3]). None to leave affinity unchanged.",
+    )
 
     # GPU configuration
     gpu_device: Optional[int] = Field(
@@ -70,6 +79,21 @@ class Settings(BaseSettings):
         description="Maximum number of concurrent transcription requests.",
         gt=0,
     )
+    max_batch_size: int = Field(
+        default=8,
+        description="Maximum number of queued transcription requests sharing one forward pass.",
+        gt=0,
+    )
+    batch_wait_ms: float = Field(
+        default=10.0,
+        description="Milliseconds to wait for more requests before running a batch.",
+        ge=0,
+    )
+    decode_workers: Optional[int] = Field(
+        default=None,
+        description="Maximum concurrent FFmpeg conversions. None to use the CPU count.",
+        gt=0,
+    )
 
     # Logging
     log_level: str = Field(
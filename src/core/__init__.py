@@ -1,6 +1,6 @@
 """Core components for parakeetv2API."""
 
-from src.core.audio_processor import AudioProcessor, audio_processor
+from src.core.audio_processor import AudioMetadata, AudioProcessor, audio_processor
 from src.core.exceptions import (
     AudioProcessingError,
     AudioValidationError,
@@ -12,6 +12,7 @@ from src.core.exceptions import (
 from src.core.model_manager import ModelManager, model_manager
 
 __all__ = [
+    "AudioMetadata",
     "AudioProcessor",
     "AudioProcessingError",
     "AudioValidationError",
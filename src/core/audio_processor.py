@@ -1,15 +1,21 @@
 """Audio processor for handling audio file conversions and validation."""
 
 import asyncio
+import io
 import json
 import logging
+import math
 import os
+import struct
 import subprocess
 import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Optional, Tuple, Union
 
-import aiofiles
+import anyio
+import numpy as np
 import soundfile as sf
 
 from src.config import settings
@@ -18,15 +24,137 @@ from src.core.exceptions import AudioProcessingError, AudioValidationError
 logger = logging.getLogger(__name__)
 
 # Supported audio formats
-SUPPORTED_FORMATS = {
+SUPPORTED_FORMATS = frozenset({
     "flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "wav", "webm"
-}
+})
 
 # Target format for model
 TARGET_SAMPLE_RATE = 16000
 TARGET_CHANNELS = 1
 TARGET_FORMAT = "wav"
 
+# Containers whose headers can be parsed without soundfile or FFprobe
+HEADER_FORMATS = frozenset({"wav", "flac"})
+
+# Containers libsndfile decodes in process; everything else goes through FFmpeg
+IN_PROCESS_FORMATS = frozenset({"wav", "flac", "ogg"})
+
+# Number of probed files whose metadata is kept in memory (keyed by path, mtime, size)
+METADATA_CACHE_SIZE = 1024
+
+# Bytes read when sniffing a header; enough to skip LIST/JUNK chunks before "fmt "
+HEADER_SNIFF_BYTES = 512
+
+
+@dataclass(slots=True, frozen=True)
+class AudioMetadata:
+    """Audio stream properties used to decide whether conversion is needed."""
+    
+    sample_rate: int
+    channels: int
+    codec_name: str
+    duration: float
+    bit_rate: int
+
+
+# WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_EXTENSIBLE
+_WAV_DIRECT_FORMATS = frozenset({0x0001, 0x0003, 0xFFFE})
+
+# Precompiled header layouts, unpacked in place with unpack_from (no slice copies)
+_RIFF_HEADER = struct.Struct("<4sI4s")  # "RIFF", size, "WAVE"
+_CHUNK_HEADER = struct.Struct("<4sI")  # chunk id, chunk size
+_WAV_FMT = struct.Struct("<HHI")  # format tag, channels, sample rate
+_FLAC_STREAMINFO_RATE = struct.Struct(">I")  # sample rate / channels bit field at byte 18
+
+
+def parse_audio_header(header: Union[bytes, memoryview]) -> Optional[Tuple[int, int]]:
+    """
+    Read sample rate and channel count from a WAV or FLAC header.
+    
+    Only the first HEADER_SNIFF_BYTES are inspected, so the whole file
+    content can be passed without slicing it first.
+    
+    Args:
+        header: File content or its leading bytes
+        
+    Returns:
+        Tuple of (sample_rate, channels), or None if the header is not a
+        PCM/float WAV or FLAC header
+    """
+    limit = min(len(header), HEADER_SNIFF_BYTES)
+    if limit < 12:
+        return None
+    
+    magic, _, wave = _RIFF_HEADER.unpack_from(header)
+    if magic == b"RIFF" and wave == b"WAVE":
+        # Walk RIFF chunks until "fmt "
+        offset = 12
+        while offset + _CHUNK_HEADER.size <= limit:
+            chunk_id, chunk_size = _CHUNK_HEADER.unpack_from(header, offset)
+            if chunk_id == b"fmt ":
+                if offset + 8 + _WAV_FMT.size > limit:
+                    return None
+                format_tag, channels, sample_rate = _WAV_FMT.unpack_from(header, offset + 8)
+                if format_tag not in _WAV_DIRECT_FORMATS:
+                    return None
+                return sample_rate, channels
+            offset += 8 + chunk_size + (chunk_size & 1)
+        return None
+    
+    if magic == b"fLaC" and limit >= 22 and header[4] & 0x7F == 0:
+        # STREAMINFO: 20-bit sample rate then 3-bit (channels - 1), starting at byte 18
+        (fields,) = _FLAC_STREAMINFO_RATE.unpack_from(header, 18)
+        return fields >> 12, ((fields >> 9) & 0x07) + 1
+    
+    return None
+
+
+def _read_header(file_path: Path) -> bytes:
+    """
+    Read the leading bytes of an audio file for header sniffing.
+    
+    Args:
+        file_path: Path to the audio file
+        
+    Returns:
+        Up to HEADER_SNIFF_BYTES bytes, or empty bytes if the file cannot be read
+    """
+    try:
+        # Unbuffered: one read syscall, no BufferedReader prefetch
+        with open(file_path, "rb", buffering=0) as f:
+            return f.read(HEADER_SNIFF_BYTES)
+    except OSError:
+        return b""
+
+
+def _decode_to_target(content: bytes) -> Optional[np.ndarray]:
+    """
+    Decode audio with libsndfile and convert it to 16 kHz mono float32.
+    
+    Args:
+        content: Encoded audio content
+        
+    Returns:
+        Converted samples, or None if resampling is needed but scipy is unavailable
+    """
+    audio, sample_rate = sf.read(io.BytesIO(content), dtype="float32", always_2d=True)
+    
+    # Downmix by averaging channels
+    audio = audio.mean(axis=1, dtype=np.float32) if audio.shape[1] > 1 else audio[:, 0]
+    
+    if sample_rate != TARGET_SAMPLE_RATE:
+        try:
+            # scipy ships with NeMo; without it FFmpeg does the resampling
+            from scipy.signal import resample_poly
+        except ImportError:
+            return None
+        
+        divisor = math.gcd(TARGET_SAMPLE_RATE, sample_rate)
+        audio = resample_poly(audio, TARGET_SAMPLE_RATE // divisor, sample_rate // divisor)
+        audio = audio.astype(np.float32, copy=False)
+    
+    return np.ascontiguousarray(audio)
+
 
 class AudioProcessor:
     """Handle audio file validation and conversion using FFmpeg."""
@@ -35,8 +163,48 @@ class AudioProcessor:
         """Initialize the audio processor."""
         self.temp_dir = Path(settings.temp_dir) if settings.temp_dir else Path(tempfile.gettempdir())
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._temp_dir_str = os.fspath(self.temp_dir)
+        self._metadata_cache: "OrderedDict[Tuple[str, int, int], AudioMetadata]" = OrderedDict()
+        # Decode stage: FFmpeg runs in its own processes while inference runs in the
+        # batcher's thread, so the two overlap across requests; this bounds the
+        # decode side so conversions cannot oversubscribe the CPU
+        self._decode_slots = asyncio.Semaphore(settings.decode_workers or os.cpu_count() or 1)
     
-    async def get_audio_metadata(self, file_path: Path) -> Optional[Dict[str, any]]:
+    async def get_audio_metadata(self, file_path: Path) -> Optional[AudioMetadata]:
+        """
+        Get audio metadata, reusing earlier probes of the same file.
+        
+        Successful probes are cached by (path, mtime, size), so a file that is
+        modified or replaced is probed again. Uploads are saved under fresh
+        names, so this only helps callers that probe the same on-disk file
+        repeatedly; failed probes are not cached and are retried.
+        
+        Args:
+            file_path: Path to the audio file
+            
+        Returns:
+            Audio metadata or None if extraction fails
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        if key in self._metadata_cache:
+            self._metadata_cache.move_to_end(key)
+            return self._metadata_cache[key]
+        
+        metadata = await self._probe_metadata(file_path)
+        if metadata is None:
+            return None
+        
+        self._metadata_cache[key] = metadata
+        if len(self._metadata_cache) > METADATA_CACHE_SIZE:
+            self._metadata_cache.popitem(last=False)
+        return metadata
+    
+    async def _probe_metadata(self, file_path: Path) -> Optional[AudioMetadata]:
         """
         Get audio metadata using soundfile (fast, no subprocesses).
         
@@ -44,14 +212,11 @@ class AudioProcessor:
             file_path: Path to the audio file
             
         Returns:
-            Audio metadata dictionary or None if extraction fails
+            Audio metadata or None if extraction fails
         """
         import time
         start_time = time.time()
         
-        if not file_path.exists():
-            return None
-        
         try:
             # Use soundfile for fast metadata extraction (no subprocess)
             info = sf.info(str(file_path))
@@ -61,29 +226,29 @@ class AudioProcessor:
             # Assume 16-bit for most audio files
             estimated_bit_rate = info.samplerate * info.channels * 16
             
-            result = {
-                "sample_rate": info.samplerate,
-                "channels": info.channels,
-                "codec_name": info.subtype.lower() if info.subtype else "unknown",
-                "duration": info.duration,
-                "bit_rate": estimated_bit_rate,
-            }
+            result = AudioMetadata(
+                sample_rate=info.samplerate,
+                channels=info.channels,
+                codec_name=info.subtype.lower() if info.subtype else "unknown",
+                duration=info.duration,
+                bit_rate=estimated_bit_rate,
+            )
             
             total_duration = (time.time() - start_time) * 1000
-            logger.info(f"Metadata extraction for {file_path.name}: {total_duration:.2f}ms (soundfile)")
-            logger.info(f"Audio format: {result['sample_rate']}Hz, {result['channels']} channels, {result['codec_name']}")
+            logger.info("Metadata extraction for %s: %.2fms (soundfile)", file_path.name, total_duration)
+            logger.info("Audio format: %sHz, %s channels, %s", result.sample_rate, result.channels, result.codec_name)
             
             return result
             
         except Exception as e:
             total_duration = (time.time() - start_time) * 1000
-            logger.info(f"Failed to get metadata for {file_path.name} after {total_duration:.2f}ms: {str(e)}")
+            logger.info("Failed to get metadata for %s after %.2fms: %s", file_path.name, total_duration, e)
             
             # Fallback to FFprobe for unsupported formats
-            logger.info(f"Falling back to FFprobe for {file_path.name}")
+            logger.info("Falling back to FFprobe for %s", file_path.name)
             return await self._get_metadata_ffprobe(file_path)
     
-    async def _get_metadata_ffprobe(self, file_path: Path) -> Optional[Dict[str, any]]:
+    async def _get_metadata_ffprobe(self, file_path: Path) -> Optional[AudioMetadata]:
         """
         Fallback metadata extraction using FFprobe for unsupported formats.
         
@@ -91,7 +256,7 @@ class AudioProcessor:
             file_path: Path to the audio file
             
         Returns:
-            Audio metadata dictionary or None if extraction fails
+            Audio metadata or None if extraction fails
         """
         import time
         start_time = time.time()
@@ -115,7 +280,7 @@ class AudioProcessor:
             stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
-                logger.info(f"FFprobe fallback failed for {file_path.name}")
+                logger.info("FFprobe fallback failed for %s", file_path.name)
                 return None
             
             # Parse metadata
@@ -128,25 +293,25 @@ class AudioProcessor:
             audio_stream = streams[0]
             
             # Extract relevant metadata
-            result = {
-                "sample_rate": int(audio_stream.get("sample_rate", 0)),
-                "channels": int(audio_stream.get("channels", 0)),
-                "codec_name": audio_stream.get("codec_name", "unknown"),
-                "duration": float(audio_stream.get("duration", 0)),
-                "bit_rate": int(audio_stream.get("bit_rate", 0)),
-            }
+            result = AudioMetadata(
+                sample_rate=int(audio_stream.get("sample_rate", 0)),
+                channels=int(audio_stream.get("channels", 0)),
+                codec_name=audio_stream.get("codec_name", "unknown"),
+                duration=float(audio_stream.get("duration", 0)),
+                bit_rate=int(audio_stream.get("bit_rate", 0)),
+            )
             
             total_duration = (time.time() - start_time) * 1000
-            logger.info(f"FFprobe fallback for {file_path.name}: {total_duration:.2f}ms")
+            logger.info("FFprobe fallback for %s: %.2fms", file_path.name, total_duration)
             
             return result
             
         except Exception as e:
             total_duration = (time.time() - start_time) * 1000
-            logger.info(f"FFprobe fallback failed for {file_path.name} after {total_duration:.2f}ms: {str(e)}")
+            logger.info("FFprobe fallback failed for %s after %.2fms: %s", file_path.name, total_duration, e)
             return None
     
-    async def needs_conversion(self, file_path: Path, metadata: Optional[Dict[str, any]] = None) -> bool:
+    async def needs_conversion(self, file_path: Path, metadata: Optional[AudioMetadata] = None) -> bool:
         """
         Check if audio file needs conversion for the model.
         
@@ -163,8 +328,8 @@ class AudioProcessor:
             
         # Check if it's already in the correct format
         if (file_path.suffix.lower() in [".wav", ".flac"] and
-            metadata.get("sample_rate") == TARGET_SAMPLE_RATE and
-            metadata.get("channels") == TARGET_CHANNELS):
+            metadata.sample_rate == TARGET_SAMPLE_RATE and
+            metadata.channels == TARGET_CHANNELS):
             return False
         
         return True
@@ -202,19 +367,20 @@ class AudioProcessor:
                 str(output_path)
             ]
             
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
+            async with self._decode_slots:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
                 error_msg = stderr.decode().strip() if stderr else "Unknown error"
                 raise AudioProcessingError(f"Audio conversion failed: {error_msg}")
             
-            logger.info(f"Converted audio: {input_path} -> {output_path}")
+            logger.info("Converted audio: %s -> %s", input_path, output_path)
             return output_path
             
         except asyncio.CancelledError:
@@ -222,7 +388,7 @@ class AudioProcessor:
         except AudioProcessingError:
             raise
         except Exception as e:
-            logger.error(f"FFmpeg error: {str(e)}")
+            logger.error("FFmpeg error: %s", e)
             raise AudioProcessingError(f"Failed to convert audio: {str(e)}")
     async def process_audio_file(self, file_path: Path) -> Tuple[Path, bool]:
         """
@@ -240,8 +406,17 @@ class AudioProcessor:
         import time
         start_time = time.time()
         
+        logger.info("Starting audio processing for %s", file_path.name)
+        
+        # Fast path: a 16 kHz mono WAV/FLAC header means no metadata probe or FFmpeg
+        if file_path.suffix.lower().lstrip(".") in HEADER_FORMATS:
+            header = await asyncio.to_thread(_read_header, file_path)
+            if parse_audio_header(header) == (TARGET_SAMPLE_RATE, TARGET_CHANNELS):
+                total_duration = (time.time() - start_time) * 1000
+                logger.info("No conversion needed for %s (header check: %.2fms)", file_path.name, total_duration)
+                return file_path, False
+        
         # Get metadata to check if conversion is needed
-        logger.info(f"Starting audio processing for {file_path.name}")
         metadata = await self.get_audio_metadata(file_path)
         
         # Check if conversion is needed (handles None metadata gracefully)
@@ -249,14 +424,14 @@ class AudioProcessor:
         conversion_check_time = (time.time() - start_time) * 1000
         
         if needs_conv:
-            logger.info(f"Conversion needed for {file_path.name} (check took {conversion_check_time:.2f}ms)")
+            logger.info("Conversion needed for %s (check took %.2fms)", file_path.name, conversion_check_time)
             try:
                 # Convert the audio
                 convert_start = time.time()
                 converted_path = await self.convert_audio(file_path)
                 convert_duration = (time.time() - convert_start) * 1000
                 total_duration = (time.time() - start_time) * 1000
-                logger.info(f"Audio conversion completed in {convert_duration:.2f}ms (total: {total_duration:.2f}ms)")
+                logger.info("Audio conversion completed in %.2fms (total: %.2fms)", convert_duration, total_duration)
                 return converted_path, True
             except AudioProcessingError:
                 # Re-raise conversion errors
@@ -266,30 +441,74 @@ class AudioProcessor:
                 raise AudioProcessingError(f"Unexpected error during conversion: {str(e)}")
         else:
             total_duration = (time.time() - start_time) * 1000
-            logger.info(f"No conversion needed for {file_path.name} (total processing: {total_duration:.2f}ms)")
+            logger.info("No conversion needed for %s (total processing: %.2fms)", file_path.name, total_duration)
             return file_path, False
     
-    async def cleanup_temp_file(self, file_path: Path) -> None:
+    async def decode_compatible_audio(self, content: bytes, extension: str) -> Optional[np.ndarray]:
+        """
+        Decode audio in memory with libsndfile instead of FFmpeg.
+        
+        16 kHz mono WAV/FLAC (checked from the header) is decoded as-is. Other
+        WAV/FLAC/OGG files are downmixed and resampled in process.
+        
+        Args:
+            content: Uploaded file content
+            extension: Validated file extension
+            
+        Returns:
+            Float32 mono samples at 16 kHz, or None if the file must go through FFmpeg
+        """
+        if extension not in IN_PROCESS_FORMATS:
+            return None
+        
+        try:
+            # In-process decoding shares the decode bound with FFmpeg conversions
+            async with self._decode_slots:
+                if (
+                    extension in HEADER_FORMATS
+                    and parse_audio_header(memoryview(content)) == (TARGET_SAMPLE_RATE, TARGET_CHANNELS)
+                ):
+                    audio, _ = await asyncio.to_thread(sf.read, io.BytesIO(content), dtype="float32")
+                else:
+                    audio = await asyncio.to_thread(_decode_to_target, content)
+            if audio is None:
+                return None
+            
+            logger.info("Decoded %s bytes in memory (%.2fs of audio)", len(content), len(audio) / TARGET_SAMPLE_RATE)
+            return audio
+            
+        except Exception as e:
+            logger.info("In-memory decode failed, falling back to disk: %s", e)
+            return None
+    
+    async def cleanup_temp_file(self, file_path: Union[str, Path]) -> None:
         """
         Clean up temporary file.
         
         Args:
             file_path: Path to temporary file
         """
+        path = file_path if isinstance(file_path, str) else os.fspath(file_path)
         try:
-            if file_path.exists() and file_path.parent == self.temp_dir:
-                file_path.unlink()
-                logger.debug(f"Cleaned up temporary file: {file_path}")
+            # Only ever delete files inside our temp directory
+            if os.path.dirname(path) == self._temp_dir_str:
+                os.unlink(path)
+                logger.debug("Cleaned up temporary file: %s", path)
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logger.warning(f"Failed to clean up temporary file {file_path}: {str(e)}")
+            logger.warning("Failed to clean up temporary file %s: %s", path, e)
     
-    async def save_uploaded_file(self, content: bytes, filename: str) -> Path:
+    async def save_uploaded_file(self, content: bytes, suffix: str) -> Path:
         """
         Save uploaded file content to temporary location.
         
+        The client's filename is never used on disk; files get a random name
+        with the validated extension, so no sanitizing is needed.
+        
         Args:
             content: File content
-            filename: Original filename
+            suffix: Validated file extension (without dot)
             
         Returns:
             Path to saved file
@@ -297,22 +516,20 @@ class AudioProcessor:
         import time
         start_time = time.time()
         
-        # Generate safe filename
-        safe_filename = f"{os.urandom(16).hex()}_{Path(filename).name}"
-        file_path = self.temp_dir / safe_filename
+        file_path = self.temp_dir / f"{os.urandom(16).hex()}.{suffix}"
         
         try:
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(content)
+            # Single worker-thread hop for open + write + close
+            await anyio.Path(file_path).write_bytes(content)
             
             duration = (time.time() - start_time) * 1000
-            logger.info(f"Saved uploaded file {filename} ({len(content)} bytes) in {duration:.2f}ms")
+            logger.info("Saved uploaded file %s (%s bytes) in %.2fms", file_path.name, len(content), duration)
             
             return file_path
             
         except Exception as e:
             duration = (time.time() - start_time) * 1000
-            logger.error(f"Failed to save uploaded file after {duration:.2f}ms: {str(e)}")
+            logger.error("Failed to save uploaded file after %.2fms: %s", duration, e)
             raise AudioProcessingError(f"Failed to save uploaded file: {str(e)}")
 
 
@@ -0,0 +1,217 @@
+"""Dynamic batching of concurrent transcription requests."""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from src.config import settings
+from src.core.exceptions import ModelError
+from src.core.logging import get_logger
+from src.core.model_manager import AudioInput, ModelManager, model_manager
+
+logger = get_logger(__name__)
+
+# Maximum ratio between the longest and shortest file in one forward pass
+MAX_LENGTH_RATIO = 2.0
+
+
+class TranscriptionBatcher:
+    """Collect overlapping transcription requests into shared forward passes."""
+
+    def __init__(
+        self,
+        manager: ModelManager = model_manager,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        """Initialize the batcher.
+        
+        Args:
+            manager: Model manager used for inference
+            max_batch_size: Maximum number of files per forward pass
+            max_wait_ms: Time to wait for more requests once one is queued
+        """
+        self.manager = manager
+        self.max_batch_size = max_batch_size or settings.max_batch_size
+        self.max_wait_ms = (
+            settings.batch_wait_ms if max_wait_ms is None else max_wait_ms
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, audio: AudioInput) -> str:
+        """Queue audio and wait for its transcription.
+        
+        Args:
+            audio: Path to a model-compatible audio file or decoded samples
+        
+        Returns:
+            Transcribed text
+        
+        Raises:
+            ModelNotLoadedError: If model is not loaded
+            ModelError: If transcription fails
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+        
+        future = loop.create_future()
+        if isinstance(audio, Path):
+            audio = str(audio)
+        self._queue.put_nowait((audio, future))
+        
+        # The worker exits once the queue drains, so idle servers hold no task
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run(self._queue))
+        return await future
+
+    def stop(self) -> None:
+        """Cancel the background worker and fail requests it has not answered.
+        
+        Queued requests fail here; the worker fails its in-flight batch when the
+        cancellation reaches it.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+        if self._queue is not None:
+            _fail_queued(self._queue, ModelError("Transcription batcher stopped"))
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Drain the queue into batches and run them."""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[Any, asyncio.Future]] = []
+        try:
+            while not queue.empty():
+                batch = [queue.get_nowait()]
+                deadline = loop.time() + self.max_wait_ms / 1000
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                for group in _partition_by_kind(batch):
+                    for bucket in _bucket_by_length(group):
+                        await self._run_bucket(bucket)
+                batch = []
+        except asyncio.CancelledError:
+            _fail_futures(batch, ModelError("Transcription batcher stopped"))
+            _fail_queued(queue, ModelError("Transcription batcher stopped"))
+            raise
+        except Exception as e:
+            # Never strand callers: fail everything this worker was responsible for
+            logger.error("batcher_failed", error_type=type(e).__name__, error=str(e))
+            error = ModelError(f"Transcription failed: {str(e)}")
+            _fail_futures(batch, error)
+            _fail_queued(queue, error)
+
+    async def _run_bucket(self, bucket: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Transcribe one bucket and resolve its futures."""
+        paths = [audio for audio, _ in bucket]
+        try:
+            texts = await asyncio.to_thread(
+                self.manager.transcribe, paths, batch_size=len(paths)
+            )
+        except Exception as e:
+            for _, future in bucket:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        logger.debug("batch_transcribed", batch_size=len(paths))
+        if len(texts) < len(bucket):
+            logger.error(
+                "batch_result_short", expected=len(bucket), received=len(texts)
+            )
+        for i, (_, future) in enumerate(bucket):
+            if future.done():
+                continue
+            if i < len(texts):
+                future.set_result(texts[i])
+            else:
+                future.set_exception(
+                    ModelError("Transcription failed: no result for this input")
+                )
+
+
+def _fail_futures(items: List[Tuple[Any, asyncio.Future]], error: Exception) -> None:
+    """Set an error on every unresolved future in (audio, future) pairs."""
+    for _, future in items:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _fail_queued(queue: asyncio.Queue, error: Exception) -> None:
+    """Drain the queue, failing each waiting request."""
+    while not queue.empty():
+        _fail_futures([queue.get_nowait()], error)
+
+
+def _partition_by_kind(
+    batch: List[Tuple[Any, asyncio.Future]],
+) -> List[List[Tuple[Any, asyncio.Future]]]:
+    """Split a batch into file paths and decoded arrays.
+
+    NeMo picks its input pipeline from the type of the inputs, so one
+    forward pass must not mix the two.
+
+    Args:
+        batch: Queued (audio, future) pairs
+
+    Returns:
+        Non-empty groups holding only paths or only arrays
+    """
+    paths = [item for item in batch if isinstance(item[0], str)]
+    arrays = [item for item in batch if not isinstance(item[0], str)]
+    return [group for group in (paths, arrays) if group]
+
+
+def _audio_size(audio: Any) -> int:
+    """Return a cheap proxy for audio duration, in 16-bit PCM bytes."""
+    if isinstance(audio, str):
+        try:
+            return os.path.getsize(audio)
+        except OSError:
+            return 0
+    return len(audio) * 2
+
+
+def _bucket_by_length(
+    batch: List[Tuple[Any, asyncio.Future]],
+) -> List[List[Tuple[Any, asyncio.Future]]]:
+    """Split a batch into similar-length groups to limit padding.
+
+    Args:
+        batch: Queued (audio, future) pairs
+
+    Returns:
+        Groups whose longest file is at most MAX_LENGTH_RATIO times the shortest
+    """
+    sized = sorted(
+        ((_audio_size(audio), (audio, future)) for audio, future in batch),
+        key=lambda x: x[0],
+    )
+    buckets: List[List[Tuple[Any, asyncio.Future]]] = []
+    smallest = 0
+    for size, item in sized:
+        if buckets and size <= max(smallest, 1) * MAX_LENGTH_RATIO:
+            buckets[-1].append(item)
+        else:
+            buckets.append([item])
+            smallest = size
+    return buckets
+
+
+# Global transcription batcher instance
+transcription_batcher = TranscriptionBatcher()
@@ -3,14 +3,21 @@
 import logging
 import threading
 from pathlib import Path
-from typing import List, Optional, Union
-
-import nemo.collections.asr as nemo_asr
-import torch
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from src.config import settings
 from src.core.exceptions import ModelError, ModelNotLoadedError
 
+if TYPE_CHECKING:
+    # torch and nemo take seconds to import; they are imported on first use
+    import nemo.collections.asr as nemo_asr
+    import numpy as np
+    import torch
+
+# Audio input accepted by transcribe: a file path or decoded 16 kHz mono samples
+# (NeMo 2.0+ is required for array inputs)
+AudioInput = Union[str, Path, "np.ndarray"]
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,9 +41,9 @@ class ModelManager:
             return
         
         self._initialized = True
-        self._model: Optional[nemo_asr.models.ASRModel] = None
+        self._model: Optional["nemo_asr.models.ASRModel"] = None
         self._model_name = settings.model_name
-        self._device: Optional[torch.device] = None
+        self._device: Optional["torch.device"] = None
         self._loading_lock = threading.Lock()
         self._is_loaded = False
     
@@ -46,15 +53,17 @@ class ModelManager:
         return self._is_loaded
     
     @property
-    def device(self) -> torch.device:
+    def device(self) -> "torch.device":
         """Get the device for model inference."""
         if self._device is None:
+            import torch
+            
             if torch.cuda.is_available():
                 if settings.gpu_device is not None:
                     self._device = torch.device(f"cuda:{settings.gpu_device}")
                 else:
                     self._device = torch.device("cuda")
-                logger.info(f"Using device: {self._device}")
+                logger.info("Using device: %s", self._device)
             else:
                 self._device = torch.device("cpu")
                 logger.warning("CUDA not available, using CPU. Performance will be degraded.")
@@ -68,7 +77,10 @@ class ModelManager:
                 return
             
             try:
-                logger.info(f"Loading model: {self._model_name}")
+                logger.info("Loading model: %s", self._model_name)
+                
+                # Heavy import deferred until the model is actually needed
+                import nemo.collections.asr as nemo_asr
                 
                 # Set cache directory if specified
                 cache_dir = None
@@ -96,7 +108,7 @@ class ModelManager:
                 logger.info("Model loaded successfully")
                 
             except Exception as e:
-                logger.error(f"Failed to load model: {str(e)}")
+                logger.error("Failed to load model: %s", e)
                 raise ModelError(f"Failed to load model '{self._model_name}': {str(e)}")
     
     def _warmup_model(self) -> None:
@@ -115,26 +127,26 @@ class ModelManager:
             existing_files = [f for f in test_files if Path(f).exists()]
             
             if existing_files:
-                logger.info(f"Running warmup with {len(existing_files)} test files")
-                # Use our transcribe method which handles different return types
-                _ = self.transcribe(existing_files)
+                logger.info("Running warmup with %s test files", len(existing_files))
+                # One batched pass, matching how the batcher drives inference
+                _ = self.transcribe(existing_files, batch_size=len(existing_files))
                 logger.info("Model warmup completed")
             else:
                 logger.warning("No test files found for warmup, skipping")
                 
         except Exception as e:
-            logger.warning(f"Model warmup failed (non-critical): {str(e)}")
+            logger.warning("Model warmup failed (non-critical): %s", e)
     
     def transcribe(
         self,
-        audio_paths: Union[str, Path, List[Union[str, Path]]],
+        audio_paths: Union[AudioInput, List[AudioInput]],
         batch_size: int = 1,
     ) -> List[str]:
         """
-        Transcribe audio files.
+        Transcribe audio files or decoded audio arrays.
         
         Args:
-            audio_paths: Path(s) to audio file(s)
+            audio_paths: Path(s) to audio file(s) or 16 kHz mono float32 array(s)
             batch_size: Batch size for inference
             
         Returns:
@@ -148,13 +160,15 @@ class ModelManager:
             raise ModelNotLoadedError()
         
         # Ensure paths are in a list
-        if isinstance(audio_paths, (str, Path)):
+        if not isinstance(audio_paths, list):
             audio_paths = [audio_paths]
         
-        # Convert to strings
-        audio_paths = [str(p) for p in audio_paths]
+        # Convert paths to strings; decoded arrays are passed through as-is
+        audio_paths = [str(p) if isinstance(p, Path) else p for p in audio_paths]
         
         try:
+            import torch
+            
             with torch.no_grad():
                 # NeMo ASR models can return different formats
                 results = self._model.transcribe(
@@ -194,7 +208,7 @@ class ModelManager:
             return transcriptions
             
         except Exception as e:
-            logger.error(f"Transcription failed: {str(e)}")
+            logger.error("Transcription failed: %s", e)
             raise ModelError(f"Transcription failed: {str(e)}")
     
     def unload_model(self) -> None:
@@ -207,6 +221,8 @@ class ModelManager:
                 self._is_loaded = False
                 
                 # Clear CUDA cache if using GPU
+                import torch
+                
                 if torch.cuda.is_available():
                     torch.cuda.empty_cache()
                 
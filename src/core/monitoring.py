@@ -3,6 +3,7 @@
 import asyncio
 import os
 import psutil
+import threading
 import time
 from typing import Dict, Optional
 
@@ -10,6 +11,12 @@ from src.core.logging import get_logger, performance_logger
 
 logger = get_logger(__name__)
 
+# Seconds between metric log lines; snapshots are refreshed more often
+LOG_INTERVAL = 60
+
+# Default seconds between snapshots
+DEFAULT_INTERVAL = 5
+
 
 class SystemMonitor:
     """Monitor system resources and health."""
@@ -19,8 +26,13 @@ class SystemMonitor:
         self.process = psutil.Process(os.getpid())
         self._monitoring = False
         self._monitoring_task = None
+        self._interval: float = DEFAULT_INTERVAL
+        self._latest: Optional[Dict[str, any]] = None
+        self._latest_time = 0.0
+        self._latest_lock = threading.Lock()
+        self._last_logged = 0.0
     
-    def start_monitoring(self, interval: int = 60) -> None:
+    def start_monitoring(self, interval: int = DEFAULT_INTERVAL) -> None:
         """Start periodic resource monitoring.
         
         Args:
@@ -30,6 +42,7 @@ class SystemMonitor:
             return
         
         self._monitoring = True
+        self._interval = interval
         self._monitoring_task = asyncio.create_task(self._monitor_loop(interval))
         logger.info("system_monitoring_started", interval=interval)
     
@@ -47,8 +60,14 @@ class SystemMonitor:
         """Background monitoring loop."""
         while self._monitoring:
             try:
-                metrics = self.get_current_metrics()
-                self._log_metrics(metrics)
+                # psutil sampling and NVML calls block, so run them off the loop
+                metrics = await asyncio.to_thread(self.get_current_metrics)
+                self._publish(metrics)
+                
+                now = time.monotonic()
+                if now - self._last_logged >= LOG_INTERVAL:
+                    self._log_metrics(metrics)
+                    self._last_logged = now
                 await asyncio.sleep(interval)
             except asyncio.CancelledError:
                 break
@@ -157,14 +176,15 @@ class SystemMonitor:
             gpu_temperature=metrics.get("gpu_temperature_c"),
         )
     
-    def check_health(self) -> Dict[str, any]:
-        """Perform health checks.
+    def _publish(self, metrics: Dict[str, float]) -> Dict[str, any]:
+        """Evaluate metrics and store them as the latest health snapshot.
         
+        Args:
+            metrics: Metrics from get_current_metrics
+            
         Returns:
             Health check results
         """
-        metrics = self.get_current_metrics()
-        
         # Define health thresholds
         warnings = []
         if metrics["process_cpu_percent"] > 80:
@@ -179,11 +199,68 @@ class SystemMonitor:
         if metrics.get("gpu_temperature_c", 0) > 80:
             warnings.append("High GPU temperature")
         
-        return {
+        snapshot = {
             "status": "degraded" if warnings else "healthy",
             "warnings": warnings,
             "metrics": metrics,
         }
+        with self._latest_lock:
+            self._latest = snapshot
+            self._latest_time = time.monotonic()
+        return snapshot
+    
+    def _snapshot(self, max_age: Optional[float]) -> Optional[Dict[str, any]]:
+        """Return the latest snapshot if it can be served without collecting.
+        
+        While the monitoring loop runs its snapshot is always served; it is
+        refreshed every interval plus the collection time. Otherwise the
+        snapshot must be newer than max_age (default: twice the interval).
+        """
+        if max_age is None:
+            max_age = 2 * self._interval
+        with self._latest_lock:
+            if self._latest is None:
+                return None
+            if self._monitoring or time.monotonic() - self._latest_time <= max_age:
+                return self._latest
+        return None
+    
+    def check_health(self, max_age: Optional[float] = None) -> Dict[str, any]:
+        """Perform health checks.
+        
+        Returns the snapshot published by the monitoring loop, so frequent
+        probes do not trigger psutil sampling or NVML calls. Metrics are only
+        collected inline when no usable snapshot exists.
+        
+        Args:
+            max_age: Maximum snapshot age in seconds when monitoring is off
+            
+        Returns:
+            Health check results
+        """
+        snapshot = self._snapshot(max_age)
+        if snapshot is not None:
+            return snapshot
+        
+        return self._publish(self.get_current_metrics())
+    
+    async def check_health_async(self, max_age: Optional[float] = None) -> Dict[str, any]:
+        """Perform health checks without blocking the event loop.
+        
+        Same as check_health, but inline collection (at least 100 ms of CPU
+        sampling plus NVML calls) runs in a worker thread.
+        
+        Args:
+            max_age: Maximum snapshot age in seconds when monitoring is off
+            
+        Returns:
+            Health check results
+        """
+        snapshot = self._snapshot(max_age)
+        if snapshot is not None:
+            return snapshot
+        
+        return self._publish(await asyncio.to_thread(self.get_current_metrics))
 
 
 # Global system monitor instance
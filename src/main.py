@@ -1,23 +1,30 @@
 """Main entry point for parakeetv2API."""
 
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from src.api import models_router, transcription_router
-from src.api.middleware import RequestTracingMiddleware, PerformanceMonitoringMiddleware
+from src.api.middleware import (
+    CompressionMiddleware,
+    PerformanceMonitoringMiddleware,
+    RequestTracingMiddleware,
+)
 from src.config import settings
+from src.core.batcher import transcription_batcher
 from src.core.exceptions import ParakeetAPIException
 from src.core.logging import setup_logging, get_logger
 from src.core.model_manager import model_manager
-from src.core.monitoring import system_monitor
+from src.services import transcription_service
 
 # Setup structured logging
 setup_logging()
@@ -27,6 +34,9 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
+    # Imported here so importing the app (e.g. per worker) stays cheap
+    from src.core.monitoring import system_monitor
+    
     # Startup
     logger.info(
         "starting_server",
@@ -43,7 +53,8 @@ async def lifespan(app: FastAPI):
     # Load ASR model
     try:
         logger.info("loading_model", model_name=settings.model_name)
-        model_manager.load_model()
+        # Load off the event loop; serving still waits until it completes
+        await asyncio.to_thread(model_manager.load_model)
         logger.info("model_loaded_successfully")
     except Exception as e:
         logger.error("model_load_failed", error=str(e), exc_info=True)
@@ -51,7 +62,10 @@ async def lifespan(app: FastAPI):
     
     # Start system monitoring
     if settings.environment == "production":
-        system_monitor.start_monitoring(interval=60)
+        system_monitor.start_monitoring(interval=5)
+    
+    # Build the OpenAPI document once so /openapi.json is a plain byte copy
+    get_openapi_bytes()
     
     logger.info("startup_complete")
     
@@ -63,6 +77,12 @@ async def lifespan(app: FastAPI):
     # Stop system monitoring
     system_monitor.stop_monitoring()
     
+    # Stop the transcription batching worker
+    transcription_batcher.stop()
+    
+    # Let in-flight temp-file cleanups finish
+    await transcription_service.wait_for_cleanup()
+    
     # Cleanup resources
     try:
         model_manager.unload_model()
@@ -190,6 +210,9 @@ app = FastAPI(
 )
 
 # Add middleware in reverse order (last added is executed first)
+# Compress large bodies (e.g. long transcripts) closest to the app
+app.add_middleware(CompressionMiddleware, minimum_size=1024, compresslevel=1)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -278,6 +301,38 @@ app.include_router(transcription_router, prefix=settings.api_prefix)
 app.include_router(models_router, prefix=settings.api_prefix)
 
 
+# Serialized OpenAPI document, built on first use (normally during startup)
+_openapi_bytes: Optional[bytes] = None
+
+
+def get_openapi_bytes() -> bytes:
+    """Get the OpenAPI schema serialized to JSON bytes.
+    
+    The schema is generated and serialized only once; later calls return
+    the cached bytes.
+    
+    Returns:
+        OpenAPI schema as JSON bytes
+    """
+    global _openapi_bytes
+    if _openapi_bytes is None:
+        _openapi_bytes = orjson.dumps(app.openapi())
+    return _openapi_bytes
+
+
+# Replace FastAPI's built-in schema route, which re-encodes the dict per request
+app.router.routes = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != app.openapi_url
+]
+
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json() -> Response:
+    """Serve the pre-serialized OpenAPI schema."""
+    return Response(get_openapi_bytes(), media_type="application/json")
+
+
 @app.get(
     "/",
     tags=["Health"],
@@ -365,7 +420,9 @@ async def health_check() -> Dict[str, Any]:
     Returns:
         Dict containing detailed health status, metrics, and any warnings
     """
-    health_data = system_monitor.check_health()
+    from src.core.monitoring import system_monitor
+    
+    health_data = await system_monitor.check_health_async()
     
     return {
         "status": health_data["status"],
@@ -377,13 +434,25 @@ async def health_check() -> Dict[str, Any]:
 
 def main():
     """Run the application."""
+    # Keep the Python-side decode work on a fixed set of cores
+    if settings.pin_cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, set(settings.pin_cpus))
+        logger.info("cpu_affinity_set", cpus=settings.pin_cpus)
+    
     uvicorn.run(
         "src.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.reload,
         log_level=settings.log_level.lower(),
-        access_log=True,
+        # Slow requests are still reported by PerformanceMonitoringMiddleware
+        access_log=settings.environment != "production",
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        timeout_keep_alive=5,
+        limit_concurrency=settings.max_concurrency,
+        backlog=2048,
     )
 
 
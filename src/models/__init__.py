@@ -2,28 +2,40 @@
 
 from src.models.requests import ModelInfoRequest, ModelListRequest, TranscriptionRequest
 from src.models.responses import (
+    AVAILABLE_MODEL_IDS,
     AVAILABLE_MODELS,
+    FIXED_USAGE,
+    FIXED_USAGE_DICT,
     ErrorDetail,
     ErrorResponse,
     ModelInfo,
     ModelListResponse,
+    ModelRecord,
     TokenUsage,
     TokenUsageDetails,
+    TokenUsageDetailsRecord,
+    TokenUsageRecord,
     TranscriptionResponse,
     get_model_info,
     get_model_list,
 )
 
 __all__ = [
+    "AVAILABLE_MODEL_IDS",
     "AVAILABLE_MODELS",
+    "FIXED_USAGE",
+    "FIXED_USAGE_DICT",
     "ErrorDetail",
     "ErrorResponse",
     "ModelInfo",
     "ModelInfoRequest",
     "ModelListRequest",
     "ModelListResponse",
+    "ModelRecord",
     "TokenUsage",
     "TokenUsageDetails",
+    "TokenUsageDetailsRecord",
+    "TokenUsageRecord",
     "TranscriptionRequest",
     "TranscriptionResponse",
     "get_model_info",
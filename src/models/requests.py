@@ -5,6 +5,7 @@ from typing import List, Literal, Optional, Union
 from pydantic import BaseModel, Field, field_validator, ValidationInfo
 
 from src.core.exceptions import UnsupportedParameterError
+from src.models.responses import AVAILABLE_MODEL_IDS
 
 
 class TranscriptionRequest(BaseModel):
@@ -55,17 +56,9 @@ class TranscriptionRequest(BaseModel):
     @classmethod
     def validate_model(cls, v: str) -> str:
         """Validate model selection."""
-        # All models are supported (they all use the same backend)
-        supported_models = {
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe", 
-            "parakeet-tdt-0.6b-v2",
-            "whisper-1"
-        }
-        
-        # We accept any model name for compatibility
+        # We accept any model name for compatibility (they all use the same backend)
         # Log if it's not one of the expected ones
-        if v not in supported_models:
+        if v not in AVAILABLE_MODEL_IDS:
             # We still accept it, just log
             import logging
             logging.getLogger(__name__).info(
@@ -1,6 +1,7 @@
 """Response models for parakeetv2API."""
 
-from typing import Dict, List, Literal, Optional
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, FrozenSet, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -120,44 +121,73 @@ class ErrorResponse(BaseModel):
     )
 
 
+# Internal fixed-value records.
+#
+# The Pydantic models above describe the API schema. The values below never
+# come from user input, so they are plain slotted, frozen dataclasses that
+# serialize straight to dicts without per-instance validation.
+
+
+@dataclass(slots=True, frozen=True)
+class TokenUsageDetailsRecord:
+    """Fixed token usage details for input."""
+    
+    text_tokens: int = 0
+    audio_tokens: int = 1
+
+
+@dataclass(slots=True, frozen=True)
+class TokenUsageRecord:
+    """Fixed token usage reported with every transcription."""
+    
+    type: str = "tokens"
+    input_tokens: int = 1
+    input_token_details: TokenUsageDetailsRecord = field(
+        default_factory=TokenUsageDetailsRecord
+    )
+    output_tokens: int = 1
+    total_tokens: int = 2
+
+
+@dataclass(slots=True, frozen=True)
+class ModelRecord:
+    """Information about a single available model."""
+    
+    id: str
+    object: str = "model"
+    created: int = 1744718400
+    owned_by: str = "parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
+
+
+# Fixed usage for all transcription responses, pre-rendered for serialization
+FIXED_USAGE = TokenUsageRecord()
+FIXED_USAGE_DICT: Dict[str, Any] = asdict(FIXED_USAGE)
+
+
 # Pre-defined model information
-AVAILABLE_MODELS = [
-    ModelInfo(
-        id="gpt-4o-transcribe",
-        object="model",
-        created=1744718400,
-        owned_by="parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
-    ),
-    ModelInfo(
-        id="gpt-4o-mini-transcribe",
-        object="model",
-        created=1744718400,
-        owned_by="parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
-    ),
-    ModelInfo(
-        id="parakeet-tdt-0.6b-v2",
-        object="model",
-        created=1744718400,
-        owned_by="parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
-    ),
-    ModelInfo(
-        id="whisper-1",
-        object="model",
-        created=1744718400,
-        owned_by="parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
-    ),
-]
+AVAILABLE_MODELS = (
+    ModelRecord(id="gpt-4o-transcribe"),
+    ModelRecord(id="gpt-4o-mini-transcribe"),
+    ModelRecord(id="parakeet-tdt-0.6b-v2"),
+    ModelRecord(id="whisper-1"),
+)
+AVAILABLE_MODEL_IDS: FrozenSet[str] = frozenset(model.id for model in AVAILABLE_MODELS)
+_MODELS_BY_ID: Dict[str, ModelRecord] = {model.id: model for model in AVAILABLE_MODELS}
+
+# The model list never changes and comes from trusted records, so build the
+# response once without running validation
+_MODEL_LIST = ModelListResponse.model_construct(
+    object="list",
+    data=[ModelInfo.model_construct(**asdict(model)) for model in AVAILABLE_MODELS],
+)
 
 
 def get_model_list() -> ModelListResponse:
     """Get the list of available models."""
-    return ModelListResponse(
-        object="list",
-        data=AVAILABLE_MODELS
-    )
+    return _MODEL_LIST
 
 
-def get_model_info(model_id: str) -> Optional[ModelInfo]:
+def get_model_info(model_id: str) -> Optional[ModelRecord]:
     """
     Get information about a specific model.
     
@@ -165,9 +195,6 @@ def get_model_info(model_id: str) -> Optional[ModelInfo]:
         model_id: The model ID to look up
         
     Returns:
-        ModelInfo if found, None otherwise
+        ModelRecord if found, None otherwise
     """
-    for model in AVAILABLE_MODELS:
-        if model.id == model_id:
-            return model
-    return None
\ No newline at end of file
+    return _MODELS_BY_ID.get(model_id)
@@ -2,11 +2,12 @@
 
 import logging
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Optional, Tuple
 
-from src.core import audio_processor
+from src.core import AudioMetadata, audio_processor
+from src.core.audio_processor import SUPPORTED_FORMATS
 from src.core.exceptions import AudioProcessingError, AudioValidationError
-from src.utils import sanitize_filename, validate_file_extension, validate_file_size
+from src.utils import validate_file_extension, validate_file_size
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +18,7 @@ class AudioService:
     def __init__(self):
         """Initialize the audio service."""
         self.audio_processor = audio_processor
-        self.supported_formats = {
-            "flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "wav", "webm"
-        }
+        self.supported_formats = SUPPORTED_FORMATS
 
     async def validate_and_save_file(
         self,
@@ -43,39 +42,37 @@ class AudioService:
             AudioProcessingError: If saving fails
         """
         logger.info(
-            f"Validating and saving audio file - filename: {filename}, "
-            f"size: {len(file_content)} bytes, request_id: {request_id}"
+            "Validating and saving audio file - filename: %s, size: %s bytes, request_id: %s",
+            filename,
+            len(file_content),
+            request_id,
         )
 
-        # Sanitize filename
-        safe_filename = sanitize_filename(filename)
-        logger.debug(f"Sanitized filename: {safe_filename}")
-
-        # Validate file extension
+        # Validate file extension; the filename is not used on disk
         try:
-            extension = validate_file_extension(safe_filename)
-            logger.debug(f"File extension validated: {extension}")
+            extension = validate_file_extension(filename)
+            logger.debug("File extension validated: %s", extension)
         except AudioValidationError as e:
-            logger.warning(f"Invalid file extension: {e.message}")
+            logger.warning("Invalid file extension: %s", e.message)
             raise
 
         # Validate file size
         try:
             validate_file_size(len(file_content))
-            logger.debug(f"File size validated: {len(file_content)} bytes")
+            logger.debug("File size validated: %s bytes", len(file_content))
         except AudioValidationError as e:
-            logger.warning(f"File size validation failed: {e.message}")
+            logger.warning("File size validation failed: %s", e.message)
             raise
 
         # Save the file
         try:
             file_path = await self.audio_processor.save_uploaded_file(
-                file_content, safe_filename
+                file_content, extension
             )
-            logger.info(f"File saved successfully: {file_path}")
+            logger.info("File saved successfully: %s", file_path)
             return file_path
         except AudioProcessingError as e:
-            logger.error(f"Failed to save file: {e.message}")
+            logger.error("Failed to save file: %s", e.message)
             raise
 
     async def process_for_transcription(
@@ -98,8 +95,9 @@ class AudioService:
             AudioProcessingError: If processing fails
         """
         logger.info(
-            f"Processing audio for transcription - file: {file_path}, "
-            f"request_id: {request_id}"
+            "Processing audio for transcription - file: %s, request_id: %s",
+            file_path,
+            request_id,
         )
 
         try:
@@ -109,24 +107,26 @@ class AudioService:
             )
 
             logger.info(
-                f"Audio processing complete - processed: {processed_path}, "
-                f"needs_cleanup: {needs_cleanup}, request_id: {request_id}"
+                "Audio processing complete - processed: %s, needs_cleanup: %s, request_id: %s",
+                processed_path,
+                needs_cleanup,
+                request_id,
             )
 
             return processed_path, needs_cleanup
 
         except AudioValidationError as e:
-            logger.warning(f"Audio validation failed: {e.message}")
+            logger.warning("Audio validation failed: %s", e.message)
             raise
         except AudioProcessingError as e:
-            logger.error(f"Audio processing failed: {e.message}")
+            logger.error("Audio processing failed: %s", e.message)
             raise
 
     async def get_audio_metadata(
         self,
         file_path: Path,
         request_id: Optional[str] = None,
-    ) -> Dict[str, any]:
+    ) -> AudioMetadata:
         """
         Get metadata for an audio file.
 
@@ -135,23 +135,25 @@ class AudioService:
             request_id: Optional request ID for logging
 
         Returns:
-            Audio metadata dictionary
+            Audio metadata
 
         Raises:
             AudioValidationError: If file is not valid audio
         """
         logger.info(
-            f"Getting audio metadata - file: {file_path}, request_id: {request_id}"
+            "Getting audio metadata - file: %s, request_id: %s",
+            file_path,
+            request_id,
         )
 
         try:
             metadata = await self.audio_processor.get_audio_metadata(file_path)
             if metadata is None:
                 raise AudioValidationError("Failed to extract audio metadata")
-            logger.debug(f"Audio metadata retrieved: {metadata}")
+            logger.debug("Audio metadata retrieved: %s", metadata)
             return metadata
         except AudioValidationError as e:
-            logger.warning(f"Failed to get audio metadata: {e.message}")
+            logger.warning("Failed to get audio metadata: %s", e.message)
             raise
 
     async def cleanup_file(
@@ -166,13 +168,13 @@ class AudioService:
             file_path: Path to file to clean up
             request_id: Optional request ID for logging
         """
-        logger.debug(f"Cleaning up file: {file_path}, request_id: {request_id}")
+        logger.debug("Cleaning up file: %s, request_id: %s", file_path, request_id)
 
         try:
             await self.audio_processor.cleanup_temp_file(file_path)
-            logger.debug(f"File cleaned up successfully: {file_path}")
+            logger.debug("File cleaned up successfully: %s", file_path)
         except Exception as e:
-            logger.warning(f"Failed to clean up file {file_path}: {str(e)}")
+            logger.warning("Failed to clean up file %s: %s", file_path, e)
 
     def is_format_supported(self, extension: str) -> bool:
         """
@@ -213,17 +215,17 @@ class AudioService:
         Raises:
             AudioValidationError: If validation fails
         """
-        logger.debug(f"Validating audio content: {file_path}, request_id: {request_id}")
+        logger.debug("Validating audio content: %s, request_id: %s", file_path, request_id)
 
         try:
             # Use the audio processor to get metadata (validates the file)
             metadata = await self.audio_processor.get_audio_metadata(file_path)
             if metadata is None:
                 raise AudioValidationError("Failed to validate audio content")
-            logger.debug(f"Audio content validation passed: {file_path}")
+            logger.debug("Audio content validation passed: %s", file_path)
             return True
         except AudioValidationError as e:
-            logger.warning(f"Audio content validation failed: {e.message}")
+            logger.warning("Audio content validation failed: %s", e.message)
             raise
 
 
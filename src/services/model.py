@@ -3,22 +3,28 @@
 import logging
 from typing import Optional
 
-from src.models import ModelInfo, ModelListResponse, get_model_info, get_model_list
+from src.models import (
+    AVAILABLE_MODEL_IDS,
+    AVAILABLE_MODELS,
+    ModelListResponse,
+    ModelRecord,
+    get_model_info,
+    get_model_list,
+)
 
 logger = logging.getLogger(__name__)
 
+# Model IDs served by the API, in display order; all map to the same backend
+SUPPORTED_MODELS_TUPLE = tuple(model.id for model in AVAILABLE_MODELS)
+SUPPORTED_MODELS = AVAILABLE_MODEL_IDS
+
 
 class ModelService:
     """Service for handling model information and queries."""
 
     def __init__(self):
         """Initialize the model service."""
-        self.supported_models = {
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe",
-            "parakeet-tdt-0.6b-v2", 
-            "whisper-1"
-        }
+        self.supported_models = SUPPORTED_MODELS
 
     def list_models(self, request_id: Optional[str] = None) -> ModelListResponse:
         """
@@ -30,18 +36,18 @@ class ModelService:
         Returns:
             List of available models
         """
-        logger.info(f"Listing models - request_id: {request_id}")
+        logger.info("Listing models - request_id: %s", request_id)
         
         model_list = get_model_list()
         
-        logger.debug(f"Returned {len(model_list.data)} models")
+        logger.debug("Returned %s models", len(model_list.data))
         return model_list
 
     def get_model_info(
         self, 
         model_id: str, 
         request_id: Optional[str] = None
-    ) -> Optional[ModelInfo]:
+    ) -> Optional[ModelRecord]:
         """
         Get information about a specific model.
 
@@ -52,14 +58,14 @@ class ModelService:
         Returns:
             Model information if found, None otherwise
         """
-        logger.info(f"Getting model info - model_id: {model_id}, request_id: {request_id}")
+        logger.info("Getting model info - model_id: %s, request_id: %s", model_id, request_id)
         
         model_info = get_model_info(model_id)
         
         if model_info:
-            logger.debug(f"Model found: {model_id}")
+            logger.debug("Model found: %s", model_id)
         else:
-            logger.warning(f"Model not found: {model_id}")
+            logger.warning("Model not found: %s", model_id)
         
         return model_info
 
@@ -101,8 +107,9 @@ class ModelService:
         
         if model_id not in self.supported_models:
             logger.info(
-                f"Using non-standard model name '{model_id}', "
-                f"will use {backend_model} backend"
+                "Using non-standard model name '%s', will use %s backend",
+                model_id,
+                backend_model,
             )
         
         return backend_model
@@ -120,7 +127,7 @@ class ModelService:
             Always True (for compatibility)
         """
         if model_id not in self.supported_models:
-            logger.info(f"Non-standard model ID: {model_id}")
+            logger.info("Non-standard model ID: %s", model_id)
         
         return True
 
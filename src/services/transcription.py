@@ -1,10 +1,14 @@
 """Transcription service for orchestrating audio transcription workflow."""
 
+import asyncio
+import logging
+import os
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from src.core import audio_processor, model_manager
+from src.core.batcher import transcription_batcher
 from src.core.exceptions import (
     AudioProcessingError,
     AudioValidationError,
@@ -13,10 +17,20 @@ from src.core.exceptions import (
 )
 from src.core.logging import get_logger, performance_logger
 from src.models import TranscriptionRequest, TranscriptionResponse
-from src.utils import sanitize_filename, validate_file_extension, validate_file_size
+from src.services.model import SUPPORTED_MODELS, SUPPORTED_MODELS_TUPLE
+from src.utils import validate_file_extension, validate_file_size
 
 logger = get_logger(__name__)
 
+# structlog filters by the stdlib level; checking it first skips building debug fields
+_stdlib_logger = logging.getLogger(__name__)
+
+# Pending background cleanups; holding references keeps tasks from being GC'd
+_BG_TASKS: set[asyncio.Task] = set()
+
+# Caps concurrent temp-file unlinks so bursts do not stampede the filesystem
+_CLEANUP_SEMAPHORE = asyncio.Semaphore(64)
+
 
 class TranscriptionService:
     """Service for handling audio transcription workflow."""
@@ -25,6 +39,7 @@ class TranscriptionService:
         """Initialize the transcription service."""
         self.audio_processor = audio_processor
         self.model_manager = model_manager
+        self.batcher = transcription_batcher
 
     async def transcribe_audio(
         self,
@@ -61,58 +76,51 @@ class TranscriptionService:
             request_id=request_id,
         )
 
-        # Validate and sanitize filename
-        safe_filename = sanitize_filename(filename)
-        
-        # Validate file extension
-        try:
-            extension = validate_file_extension(safe_filename)
-            logger.debug("file_extension_validated", extension=extension)
-        except AudioValidationError as e:
-            logger.warning("invalid_file_extension", error=e.message, filename=filename)
-            raise
-
-        # Validate file size
-        try:
-            validate_file_size(len(file_content))
-            logger.debug("file_size_validated", size_bytes=len(file_content))
-        except AudioValidationError as e:
-            logger.warning("file_size_validation_failed", error=e.message, size_bytes=len(file_content))
-            raise
-
-        # Save uploaded file
-        try:
-            uploaded_file_path = await self.audio_processor.save_uploaded_file(
-                file_content, safe_filename
-            )
-            logger.debug("file_saved", path=str(uploaded_file_path))
-        except AudioProcessingError as e:
-            logger.error("file_save_failed", error=e.message)
-            raise
+        # Validate upload; the filename only supplies the extension
+        extension, _ = self._validate_upload(file_content, filename)
 
         # Process and transcribe
+        uploaded_file_path = None
         processed_file_path = None
         needs_cleanup = False
 
         try:
-            # Process audio file (validate and convert if needed)
             processing_start = time.time()
-            processed_file_path, needs_cleanup = await self.audio_processor.process_audio_file(
-                uploaded_file_path
-            )
+            
+            # 16 kHz mono WAV/FLAC is decoded in memory and never written to disk
+            audio = await self.audio_processor.decode_compatible_audio(file_content, extension)
+            
+            if audio is None:
+                # Save uploaded file
+                try:
+                    uploaded_file_path = await self.audio_processor.save_uploaded_file(
+                        file_content, extension
+                    )
+                    logger.debug("file_saved", path=str(uploaded_file_path))
+                except AudioProcessingError as e:
+                    logger.error("file_save_failed", error=e.message)
+                    raise
+                
+                # Process audio file (validate and convert if needed)
+                processed_file_path, needs_cleanup = await self.audio_processor.process_audio_file(
+                    uploaded_file_path
+                )
+                audio = processed_file_path
             processing_duration_ms = (time.time() - processing_start) * 1000
             
-            logger.debug(
-                "audio_processing_complete",
-                processed_path=str(processed_file_path),
-                needs_cleanup=needs_cleanup,
-                duration_ms=round(processing_duration_ms, 2),
-            )
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "audio_processing_complete",
+                    processed_path=str(processed_file_path) if processed_file_path else None,
+                    in_memory=processed_file_path is None,
+                    needs_cleanup=needs_cleanup,
+                    duration_ms=round(processing_duration_ms, 2),
+                )
             
             # Log audio processing performance
             performance_logger.log_audio_processing(
                 request_id=request_id,
-                operation="process_audio",
+                operation="process_audio" if processed_file_path else "decode_in_memory",
                 duration_ms=processing_duration_ms,
                 input_format=extension,
             )
@@ -121,21 +129,18 @@ class TranscriptionService:
             if not self.model_manager.is_loaded:
                 raise ModelNotLoadedError()
 
-            # Transcribe using the model
+            # Transcribe using the model, sharing a forward pass with concurrent requests
             inference_start = time.time()
-            transcriptions = self.model_manager.transcribe(processed_file_path)
+            text = await self.batcher.submit(audio)
             inference_duration_ms = (time.time() - inference_start) * 1000
             
             # Debug logging
-            logger.debug(
-                "transcription_result",
-                transcriptions_type=type(transcriptions).__name__,
-                transcriptions_length=len(transcriptions) if transcriptions else 0,
-                transcriptions_content=str(transcriptions)[:200] if transcriptions else None,
-            )
-            
-            # Get the first (and only) transcription
-            text = transcriptions[0] if transcriptions else ""
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "transcription_result",
+                    text_type=type(text).__name__,
+                    text_content=str(text)[:200] if text else None,
+                )
             
             # Ensure text is a string
             if not isinstance(text, str):
@@ -182,8 +187,39 @@ class TranscriptionService:
             raise ModelError(f"Transcription failed: {str(e)}")
 
         finally:
-            # Cleanup temporary files
-            await self._cleanup_files(uploaded_file_path, processed_file_path, needs_cleanup)
+            # Cleanup temporary files in the background; the response does not wait on unlinks
+            if uploaded_file_path is not None:
+                task = asyncio.create_task(
+                    self._cleanup_files(uploaded_file_path, processed_file_path, needs_cleanup)
+                )
+                _BG_TASKS.add(task)
+                task.add_done_callback(_BG_TASKS.discard)
+
+    def _validate_upload(self, file_content: bytes, filename: str) -> Tuple[str, int]:
+        """
+        Validate extension and size of an upload in one pass.
+
+        Args:
+            file_content: Audio file content as bytes
+            filename: Original filename
+
+        Returns:
+            Tuple of (extension, size_bytes)
+
+        Raises:
+            AudioValidationError: If extension or size is invalid
+        """
+        size = len(file_content)
+        
+        try:
+            extension = validate_file_extension(filename)
+            validate_file_size(size)
+        except AudioValidationError as e:
+            logger.warning("upload_validation_failed", error=e.message, filename=filename, size_bytes=size)
+            raise
+        
+        logger.debug("upload_validated", extension=extension, size_bytes=size)
+        return extension, size
 
     async def _cleanup_files(
         self,
@@ -199,36 +235,44 @@ class TranscriptionService:
             processed_file_path: Path to processed file (if different)
             needs_cleanup: Whether processed file needs cleanup
         """
-        try:
-            # Always cleanup uploaded file
-            await self.audio_processor.cleanup_temp_file(uploaded_file_path)
-            logger.debug("cleaned_up_uploaded_file", path=str(uploaded_file_path))
-
-            # Cleanup processed file if it's different from uploaded
-            if (
-                needs_cleanup
-                and processed_file_path
-                and processed_file_path != uploaded_file_path
-            ):
-                await self.audio_processor.cleanup_temp_file(processed_file_path)
-                logger.debug("cleaned_up_processed_file", path=str(processed_file_path))
+        # Always cleanup uploaded file
+        paths = [uploaded_file_path]
 
-        except Exception as e:
-            logger.warning("cleanup_error", error=str(e))
+        # Cleanup processed file if it's different from uploaded
+        if (
+            needs_cleanup
+            and processed_file_path
+            and processed_file_path != uploaded_file_path
+        ):
+            paths.append(processed_file_path)
+
+        # Independent unlinks, so run them concurrently
+        async with _CLEANUP_SEMAPHORE:
+            results = await asyncio.gather(
+                *(self.audio_processor.cleanup_temp_file(path) for path in paths),
+                return_exceptions=True,
+            )
+        errors = [str(r) for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.warning("cleanup_error", errors=errors)
+        elif _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("cleaned_up_files", paths=[os.fspath(p) for p in paths])
+
+    async def wait_for_cleanup(self) -> None:
+        """Wait for pending background temp-file cleanups to finish."""
+        loop = asyncio.get_running_loop()
+        pending = [task for task in _BG_TASKS if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    def get_supported_models(self) -> list[str]:
+    def get_supported_models(self) -> tuple[str, ...]:
         """
-        Get list of supported model names.
+        Get supported model names.
 
         Returns:
-            List of supported model names
+            Tuple of supported model names
         """
-        return [
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe", 
-            "parakeet-tdt-0.6b-v2",
-            "whisper-1"
-        ]
+        return SUPPORTED_MODELS_TUPLE
 
     def is_model_supported(self, model_name: str) -> bool:
         """
@@ -240,7 +284,7 @@ class TranscriptionService:
         Returns:
             True if model is supported
         """
-        return model_name in self.get_supported_models()
+        return model_name in SUPPORTED_MODELS
 
 
 # Global transcription service instance
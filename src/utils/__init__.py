@@ -2,6 +2,7 @@
 
 from src.utils.validators import (
     compare_transcriptions,
+    compare_transcriptions_precomputed,
     normalize_transcription,
     sanitize_filename,
     validate_file_extension,
@@ -10,6 +11,7 @@ from src.utils.validators import (
 
 __all__ = [
     "compare_transcriptions",
+    "compare_transcriptions_precomputed",
     "normalize_transcription",
     "sanitize_filename", 
     "validate_file_extension",
@@ -1,13 +1,36 @@
 """Validation utilities for parakeetv2API."""
 
 import re
-from pathlib import Path
+from functools import lru_cache
 from typing import Optional
 
 from src.config import settings
 from src.core.audio_processor import SUPPORTED_FORMATS
 from src.core.exceptions import AudioValidationError
 
+# Compiled once at import; validation runs on every request
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9._-]')
+
+# Listed in every extension error message
+_SUPPORTED_FORMATS_STR = ', '.join(sorted(SUPPORTED_FORMATS))
+
+# Upload size limit, fixed for the life of the process
+_MAX_SIZE = settings.max_audio_file_size
+_MAX_MB_STR = f"{_MAX_SIZE / (1024 * 1024):.1f}MB"
+
+# Byte translation table for sanitize_filename: keep [a-zA-Z0-9._-], map every
+# other byte to '_' (only applied to ASCII names)
+_SAFE_FILENAME_BYTES = frozenset(
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-'
+)
+_SANITIZE_TABLE = bytes(c if c in _SAFE_FILENAME_BYTES else 0x5F for c in range(256))
+
+# Byte translation table for normalize_transcription: keep a-z and 0-9, map every
+# other byte (punctuation, whitespace, '?' from non-ASCII) to a space
+_NORMALIZE_TABLE = bytes(
+    c if 0x61 <= c <= 0x7A or 0x30 <= c <= 0x39 else 0x20 for c in range(256)
+)
+
 
 def validate_file_extension(filename: str) -> str:
     """
@@ -22,58 +45,73 @@ def validate_file_extension(filename: str) -> str:
     Raises:
         AudioValidationError: If extension is not supported
     """
-    path = Path(filename)
-    extension = path.suffix.lower().lstrip(".")
+    # str.rpartition avoids building a Path on the request path; as with
+    # Path.suffix, a name that only starts with a dot (".wav") has no extension
+    stem, _, extension = filename.rpartition('/')[2].rpartition('.')
+    extension = extension.lower() if stem else ''
     
     if not extension:
         raise AudioValidationError(
             "No file extension found. "
-            f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
+            f"Supported formats: {_SUPPORTED_FORMATS_STR}"
         )
     
     if extension not in SUPPORTED_FORMATS:
         raise AudioValidationError(
             f"Unsupported file format: {extension}. "
-            f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
+            f"Supported formats: {_SUPPORTED_FORMATS_STR}"
         )
     
     return extension
 
 
-def validate_file_size(size: int) -> None:
+def validate_file_size(
+    size: int,
+    _limit: int = _MAX_SIZE,
+    _max_str: str = _MAX_MB_STR,
+) -> None:
     """
     Validate file size is within limits.
     
+    The limit is bound from settings at import time (settings are loaded once
+    at startup), so the check is a single local comparison.
+    
     Args:
         size: File size in bytes
         
     Raises:
         AudioValidationError: If file is too large
     """
-    if size > settings.max_audio_file_size:
-        max_mb = settings.max_audio_file_size / (1024 * 1024)
-        size_mb = size / (1024 * 1024)
+    if size > _limit:
         raise AudioValidationError(
-            f"File too large: {size_mb:.1f}MB. Maximum allowed: {max_mb:.1f}MB"
+            f"File too large: {size / 1048576:.1f}MB. Maximum allowed: {_max_str}"
         )
 
 
+@lru_cache(maxsize=256)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename to prevent path traversal attacks.
     
+    Results are memoized for retried and resubmitted uploads. The cache is kept
+    small because its keys are client-supplied names of unbounded length.
+    
     Args:
         filename: Original filename
         
     Returns:
         Sanitized filename
     """
-    # Remove any path components
-    filename = Path(filename).name
+    # Remove any path components (POSIX and Windows separators)
+    filename = filename.rsplit('/', 1)[-1].rsplit('\\', 1)[-1]
     
     # Remove potentially dangerous characters
     # Keep only alphanumeric, dots, hyphens, underscores
-    filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
+    if filename.isascii():
+        # One C-level bytes.translate pass; the regex handles the non-ASCII case
+        filename = filename.encode('ascii').translate(_SANITIZE_TABLE).decode('ascii')
+    else:
+        filename = _UNSAFE_FILENAME_RE.sub('_', filename)
     
     # Ensure it has a valid extension
     if '.' not in filename:
@@ -90,27 +128,26 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
+@lru_cache(maxsize=1024)
 def normalize_transcription(text: str) -> str:
     """
     Normalize transcription text for comparison in tests.
     
+    Results are memoized: the same reference text and the same model output
+    are compared many times across a test run.
+    
     Args:
         text: Transcription text
         
     Returns:
         Normalized text (lowercase, no punctuation)
     """
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove punctuation and extra whitespace
-    # Keep only letters, numbers, and spaces
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    
-    # Normalize whitespace
-    text = ' '.join(text.split())
+    # Lowercase, then map anything outside [a-z0-9] to a space in one C-level pass.
+    # Non-ASCII characters become '?' and are therefore blanked like punctuation.
+    data = text.lower().encode('ascii', 'replace').translate(_NORMALIZE_TABLE)
     
-    return text.strip()
+    # split() drops leading/trailing spaces and collapses runs without a regex pass
+    return b' '.join(data.split()).decode('ascii')
 
 
 def compare_transcriptions(actual: str, expected: str, strict: bool = False) -> bool:
@@ -125,7 +162,23 @@ def compare_transcriptions(actual: str, expected: str, strict: bool = False) ->
     Returns:
         True if transcriptions match
     """
-    if strict:
+    if strict or actual == expected:
         return actual == expected
     
-    return normalize_transcription(actual) == normalize_transcription(expected)
\ No newline at end of file
+    # No length-based early reject: normalization can drop any number of
+    # characters ("..." and "" both normalize to "")
+    return normalize_transcription(actual) == normalize_transcription(expected)
+
+
+def compare_transcriptions_precomputed(actual: str, expected_norm: str) -> bool:
+    """
+    Compare a transcription against an already-normalized expected text.
+    
+    Args:
+        actual: Actual transcription
+        expected_norm: Output of normalize_transcription for the expected text
+        
+    Returns:
+        True if the normalized actual transcription matches
+    """
+    return normalize_transcription(actual) == expected_norm
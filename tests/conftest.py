@@ -1,69 +1,112 @@
 """Pytest configuration and fixtures."""
 
-import asyncio
-import os
-import tempfile
 from pathlib import Path
-from typing import AsyncGenerator, AsyncIterator, Generator
+from typing import Callable, Dict, FrozenSet, Generator, Optional, Tuple
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 
-from src.main import app
+NON_AUDIO_DIR = Path(__file__).parent / "non_audio_files"
 
+# Markers applied by test directory, in precedence order
+MARKER_BY_DIR = {
+    "unit": pytest.mark.unit,
+    "integration": pytest.mark.integration,
+    "e2e": pytest.mark.e2e,
+}
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def test_client() -> Generator[TestClient, None, None]:
-    """Create a test client for the FastAPI app."""
+    """Create an in-process test client for the FastAPI app, shared across the session.
+    
+    The lifespan is not entered, matching async_client, so no model is loaded.
+    """
+    from src.main import app
+    client = TestClient(app)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def fresh_client() -> Generator[TestClient, None, None]:
+    """Create a per-test client that runs the full app lifespan.
+    
+    Opt-in for tests that need startup/shutdown isolation; this loads the model.
+    """
+    from src.main import app
     with TestClient(app) as client:
         yield client
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="session")
 async def async_client():
-    """Create an async test client for the FastAPI app."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    """Create an async test client for the FastAPI app, shared across the session.
+    
+    ASGITransport never runs the lifespan, so no model is loaded; tests that
+    need startup should use fresh_client.
+    """
+    from src.main import app
+    transport = ASGITransport(app=app)
+    # In-process calls never touch the network, so there is nothing to time out
+    async with AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
         yield client
 
 
+@pytest.fixture(scope="session")
+def oversized_upload() -> bytes:
+    """Zero-filled upload one byte over the configured size limit, built once."""
+    from src.config import settings
+    return bytes(settings.max_audio_file_size + 1)
+
+
 @pytest.fixture
-def temp_audio_file() -> Generator[Path, None, None]:
-    """Create a temporary audio file for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        temp_path = Path(tmp.name)
-    
-    yield temp_path
+def temp_audio_file(tmp_path: Path) -> Path:
+    """Create a temporary audio file for testing.
     
-    # Cleanup
-    if temp_path.exists():
-        temp_path.unlink()
+    Lives under pytest's tmp_path, so pytest removes it per its retention policy.
+    """
+    temp_path = tmp_path / "audio.wav"
+    temp_path.touch()
+    return temp_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_audio_dir() -> Path:
     """Get the path to test audio files."""
     return Path(__file__).parent / "audio_files"
 
 
-@pytest.fixture
-def test_non_audio_dir() -> Path:
-    """Get the path to test non-audio files."""
-    return Path(__file__).parent / "non_audio_files"
+@pytest.fixture(scope="session")
+def audio_bytes_cache() -> Callable[[Path], bytes]:
+    """Read test audio files at most once per session.
+    
+    Returns:
+        Function mapping a file path to its contents, memoized by path
+    """
+    cache: Dict[Path, bytes] = {}
+    
+    def _load(path: Path) -> bytes:
+        content = cache.get(path)
+        if content is None:
+            content = cache[path] = path.read_bytes()
+        return content
+    
+    return _load
 
 
-@pytest.fixture(autouse=True)
-def reset_environment():
-    """Reset environment variables before each test."""
-    # Store original environment
-    original_env = dict(os.environ)
+@pytest.fixture(scope="session")
+def test_non_audio_dir() -> Tuple[Optional[Path], FrozenSet[str]]:
+    """Get the test non-audio directory and the names of the files it holds.
     
-    yield
-    
-    # Restore original environment
-    os.environ.clear()
-    os.environ.update(original_env)
+    Returns:
+        Tuple of (directory, file names), or (None, frozenset()) if it is missing
+    """
+    if not NON_AUDIO_DIR.is_dir():
+        return None, frozenset()
+    return NON_AUDIO_DIR, frozenset(p.name for p in NON_AUDIO_DIR.iterdir() if p.is_file())
 
 
 @pytest.fixture
@@ -86,16 +129,28 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "e2e: End-to-end tests")
     config.addinivalue_line("markers", "slow: Slow running tests")
     config.addinivalue_line("markers", "gpu: Tests requiring GPU")
+    config.addinivalue_line("markers", "inprocess: Tests served in-process via ASGITransport")
 
 
 # Test collection hooks
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on test location."""
+    # Deselect tests whose data directory is missing before any fixture setup
+    if not NON_AUDIO_DIR.is_dir():
+        deselected = [item for item in items if "test_non_audio_dir" in getattr(item, "fixturenames", ())]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if "test_non_audio_dir" not in getattr(item, "fixturenames", ())]
+    
+    session_loop = pytest.mark.asyncio(scope="session")
     for item in items:
+        # Run async tests on the session loop so they can share async_client
+        if item.get_closest_marker("asyncio") is not None:
+            item.add_marker(session_loop, append=False)
+        
         # Add markers based on test file location
-        if "unit" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
-        elif "integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
-        elif "e2e" in str(item.fspath):
-            item.add_marker(pytest.mark.e2e)
\ No newline at end of file
+        parts = item.path.parts
+        for dir_name, marker in MARKER_BY_DIR.items():
+            if dir_name in parts:
+                item.add_marker(marker)
+                break
\ No newline at end of file
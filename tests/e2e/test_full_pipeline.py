@@ -1,25 +1,136 @@
 """Comprehensive end-to-end tests for the full pipeline with real server and all test files."""
 
 import asyncio
-import io
+import atexit
+import signal
+import statistics
 import subprocess
 import sys
 import time
+import wave
 import os
+from dataclasses import dataclass
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 import pytest
+import pytest_asyncio
 import requests
+from requests.adapters import HTTPAdapter
 from fastapi import status
 
-from src.utils.validators import compare_transcriptions
+from src.utils.validators import compare_transcriptions_precomputed, normalize_transcription
 
+AUDIO_DIR = Path("./tests/audio_files/")
 
-@pytest.fixture(scope="module")
+# Every file in AUDIO_DIR should transcribe to this
+EXPECTED_TRANSCRIPTION = "The quick brown fox jumped over the lazy dog"
+
+# MIME type sent for each audio extension, in test order
+_MIME_BY_EXT = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+    ".webm": "audio/webm",
+    ".mp4": "video/mp4",
+    ".mpeg": "audio/mpeg",
+    ".mpga": "audio/mpeg",
+}
+
+# Audio extensions exercised by the transcription tests
+AUDIO_EXTS = tuple(_MIME_BY_EXT)
+
+# Sort rank of each extension, so ordering files is a dict lookup per file
+_EXT_ORDER = {ext: i for i, ext in enumerate(AUDIO_EXTS)}
+
+# Malformed uploads exercised by the file format edge case test
+EDGE_CASES = [
+    # Empty file
+    {"filename": "empty.wav", "content": b"", "should_fail": True},
+    
+    # Very small file
+    {"filename": "tiny.wav", "content": b"fake", "should_fail": True},
+    
+    # File with wrong extension
+    {"filename": "notaudio.wav", "content": b"This is not audio content", "should_fail": True},
+    
+    # Invalid extension
+    {"filename": "test.xyz", "content": b"content", "should_fail": True},
+    
+    # No extension
+    {"filename": "noextension", "content": b"content", "should_fail": True},
+]
+
+# Concurrent requests fired by the load test
+E2E_LOAD_N = int(os.environ.get("E2E_LOAD_N", "20"))
+
+# Set to a file path to capture the e2e server's stdout/stderr there
+E2E_SERVER_LOG = os.environ.get("E2E_SERVER_LOG")
+
+
+@dataclass(slots=True)
+class Failure:
+    """A test file the server did not handle as expected."""
+    
+    file: str
+    reason: str
+    status_code: Optional[int] = None
+    response: Any = None
+    error: Optional[str] = None
+
+
+def _audio_files() -> List[Path]:
+    """List the test audio files, grouped by extension in AUDIO_EXTS order."""
+    if not AUDIO_DIR.exists():
+        return []
+    return sorted(
+        (p for p in AUDIO_DIR.iterdir() if p.suffix in _EXT_ORDER),
+        key=lambda p: (_EXT_ORDER[p.suffix], p.name),
+    )
+
+
+def _silent_wav(seconds: float = 0.1, sample_rate: int = 16000) -> bytes:
+    """Build a short mono 16-bit silent WAV in memory."""
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(int(seconds * sample_rate) * 2))
+    return buffer.getvalue()
+
+
+def _stop_server(server_process: subprocess.Popen) -> None:
+    """Terminate the server's whole process group, killing it if it lingers."""
+    if server_process.poll() is not None:
+        return
+    
+    try:
+        if sys.platform == "win32":
+            server_process.terminate()
+        else:
+            os.killpg(server_process.pid, signal.SIGTERM)
+        try:
+            server_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            if sys.platform == "win32":
+                server_process.kill()
+            else:
+                os.killpg(server_process.pid, signal.SIGKILL)
+            server_process.wait()
+    except ProcessLookupError:
+        # Exited between the poll and the signal
+        pass
+
+
+@pytest.fixture(scope="session")
 def server_url():
-    """Start a real server instance for testing."""
+    """Start a real server instance, shared by every test in the session."""
     # Create a temporary config for testing
     test_config = {
         "PORT": "8012",  # Use different port to avoid conflicts
@@ -33,317 +144,239 @@ def server_url():
     env = os.environ.copy()
     env.update(test_config)
     
+    # Own process group so teardown also reaches any uvicorn children
+    if sys.platform == "win32":
+        group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group_kwargs = {"start_new_session": True}
+    
+    # Write logs straight to a file, never a pipe nobody drains, so the
+    # server cannot block on a full pipe buffer
+    server_log = open(E2E_SERVER_LOG, "wb") if E2E_SERVER_LOG else None
+    
     server_process = subprocess.Popen(
         [sys.executable, "-m", "uvicorn", "src.main:app", 
          "--host", "127.0.0.1", "--port", "8012"],
         env=env,
-        stdout=subprocess.DEVNULL,  # Avoid blocking on pipe buffer
-        stderr=subprocess.DEVNULL   # Avoid blocking on pipe buffer
+        stdout=server_log or subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if server_log else subprocess.DEVNULL,
+        **group_kwargs,
     )
+    # Backstop for interpreter exits that skip fixture teardown
+    atexit.register(_stop_server, server_process)
     
-    # Wait for server to start
+    # Wait for server to start, polling with backoff on one keep-alive session
     server_url = "http://127.0.0.1:8012"
-    max_retries = 60  # Increase timeout for model loading
-    retry_count = 0
+    deadline = time.monotonic() + 120  # Generous timeout for model loading
+    delay = 0.05
+    ready = False
     
-    while retry_count < max_retries:
-        try:
-            response = requests.get(f"{server_url}/health", timeout=5)
-            if response.status_code == 200:
-                # Extra wait to ensure model is fully loaded
-                time.sleep(5)
-                break
-        except (requests.exceptions.ConnectionError, requests.exceptions.RequestException):
-            pass
-        
-        time.sleep(1)
-        retry_count += 1
-    else:
-        server_process.terminate()
+    with requests.Session() as probe:
+        # A single pooled loopback connection is all the probe needs
+        probe.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        while time.monotonic() < deadline and server_process.poll() is None:
+            try:
+                response = probe.get(f"{server_url}/health", timeout=2)
+                if response.status_code == 200:
+                    # Confirm the API is serving before handing out the URL
+                    for _ in range(30):
+                        models = probe.get(f"{server_url}/v1/models", timeout=5)
+                        if models.ok and models.json().get("data"):
+                            break
+                        time.sleep(0.2)
+                    ready = True
+                    break
+            except requests.exceptions.RequestException:
+                pass
+            
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+    
+    if not ready:
+        _stop_server(server_process)
+        if server_log:
+            server_log.close()
         pytest.fail("Server failed to start within timeout")
     
+    # Pay the first-inference warmup here rather than in the first timed test
+    try:
+        requests.post(
+            f"{server_url}/v1/audio/transcriptions",
+            files={"file": ("warm.wav", _silent_wav(), "audio/wav")},
+            data={"model": "whisper-1"},
+            timeout=120,
+        )
+    except requests.exceptions.RequestException:
+        pass
+    
     yield server_url
     
     # Cleanup: terminate the server
-    server_process.terminate()
-    try:
-        server_process.wait(timeout=10)
-    except subprocess.TimeoutExpired:
-        server_process.kill()
+    _stop_server(server_process)
+    atexit.unregister(_stop_server)
+    if server_log:
+        server_log.close()
 
 
-class TestFullPipeline:
-    """Test the complete pipeline with a real server against all test files."""
+@pytest.fixture(scope="module")
+def audio_corpus() -> Dict[Path, bytes]:
+    """Read every test audio file once."""
+    return {p: p.read_bytes() for p in _audio_files()}
 
-    @pytest.fixture
-    def expected_transcription(self):
-        """Expected transcription text for audio test files."""
-        return "The quick brown fox jumped over the lazy dog"
 
-    @pytest.mark.e2e
-    @pytest.mark.slow  
-    @pytest.mark.asyncio
-    async def test_all_audio_files_transcription_batch_1(self, server_url, expected_transcription):
-        """Test transcription of audio files (batch 1: files 1-25)."""
-        await self._test_audio_files_batch(server_url, expected_transcription, 0, 25)
+@pytest.fixture(scope="module")
+def expected_norm() -> str:
+    """Normalized expected transcription, computed once for every file test."""
+    return normalize_transcription(EXPECTED_TRANSCRIPTION)
 
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    @pytest.mark.asyncio
-    async def test_all_audio_files_transcription_batch_2(self, server_url, expected_transcription):
-        """Test transcription of audio files (batch 2: files 26-50)."""
-        await self._test_audio_files_batch(server_url, expected_transcription, 25, 50)
 
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    @pytest.mark.asyncio
-    async def test_all_audio_files_transcription_batch_3(self, server_url, expected_transcription):
-        """Test transcription of audio files (batch 3: files 51-73)."""
-        await self._test_audio_files_batch(server_url, expected_transcription, 50, 73)
-
-    async def _test_audio_files_batch(self, server_url, expected_transcription, start_idx, end_idx):
-        """Helper method to test a batch of audio files."""
-        audio_dir = Path("./tests/audio_files/")
-        if not audio_dir.exists():
-            pytest.skip("Audio files directory not found")
-
-        # Get all audio files
-        audio_files = []
-        for pattern in ["*.wav", "*.mp3", "*.flac", "*.m4a", "*.ogg", "*.webm", "*.mp4", "*.mpeg", "*.mpga"]:
-            audio_files.extend(audio_dir.glob(pattern))
-
-        if not audio_files:
-            pytest.skip("No audio files found in test directory")
-
-        # Get the batch
-        batch_files = audio_files[start_idx:end_idx]
-        if not batch_files:
-            pytest.skip(f"No files in batch {start_idx}-{end_idx}")
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """Pooled HTTP client shared by every full-pipeline test.
+    
+    Session-scoped so it lives on the same event loop as the tests; requests
+    use absolute server_url paths, which all resolve to the same pool.
+    """
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    timeout = httpx.Timeout(120.0, connect=5.0)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        yield client
 
-        success_count = 0
-        failure_count = 0
-        failures: List[Dict] = []
-
-        # Process files sequentially to avoid overwhelming the server
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            for i, audio_file in enumerate(batch_files):
-                print(f"Processing file {start_idx + i + 1}/{len(audio_files)}: {audio_file.name}")
-                try:
-                    with open(audio_file, "rb") as f:
-                        audio_content = f.read()
-
-                    # Determine MIME type based on extension
-                    mime_types = {
-                        ".wav": "audio/wav",
-                        ".mp3": "audio/mpeg", 
-                        ".flac": "audio/flac",
-                        ".m4a": "audio/mp4",
-                        ".ogg": "audio/ogg",
-                        ".webm": "audio/webm",
-                        ".mp4": "video/mp4",
-                        ".mpeg": "audio/mpeg",
-                        ".mpga": "audio/mpeg"
-                    }
-                    mime_type = mime_types.get(audio_file.suffix.lower(), "audio/*")
-
-                    files = {"file": (audio_file.name, io.BytesIO(audio_content), mime_type)}
-                    data = {"model": "whisper-1"}
-
-                    response = await client.post(f"{server_url}/v1/audio/transcriptions", 
-                                               files=files, data=data)
-                    
-                    # Small delay between requests to avoid overwhelming the server
-                    await asyncio.sleep(0.05)
-
-                    if response.status_code == status.HTTP_200_OK:
-                        result = response.json()
-                        
-                        # Verify response structure with detailed error handling
-                        if "text" not in result:
-                            failure_count += 1
-                            failures.append({
-                                "file": audio_file.name,
-                                "reason": f"No 'text' field in response. Response: {result}",
-                                "response": result
-                            })
-                            continue
-                            
-                        if "usage" not in result:
-                            failure_count += 1
-                            failures.append({
-                                "file": audio_file.name,
-                                "reason": f"No 'usage' field in response. Response: {result}",
-                                "response": result
-                            })
-                            continue
-                        
-                        # Verify transcription content (case-insensitive, flexible comparison)
-                        transcribed_text = result["text"]
-                        
-                        if compare_transcriptions(transcribed_text, expected_transcription, strict=False):
-                            success_count += 1
-                        else:
-                            failure_count += 1
-                            failures.append({
-                                "file": audio_file.name,
-                                "expected": expected_transcription,
-                                "actual": transcribed_text,
-                                "reason": "Transcription mismatch"
-                            })
-                    else:
-                        failure_count += 1
-                        failures.append({
-                            "file": audio_file.name,
-                            "status_code": response.status_code,
-                            "response": response.text,
-                            "reason": "HTTP error"
-                        })
-
-                except Exception as e:
-                    failure_count += 1
-                    failures.append({
-                        "file": audio_file.name,
-                        "error": str(e),
-                        "reason": "Exception during test"
-                    })
 
-        # Report results
-        print(f"\nBatch {start_idx+1}-{end_idx} results:")
-        print(f"Files processed: {len(batch_files)}")
-        print(f"Successful: {success_count}")
-        print(f"Failed: {failure_count}")
-        
-        if failures:
-            print(f"Failures:")
-            for failure in failures:
-                print(f"  {failure['file']}: {failure['reason']}")
-                if 'actual' in failure:
-                    print(f"    Expected: {failure['expected']}")
-                    print(f"    Actual: {failure['actual']}")
+class TestFullPipeline:
+    """Test the complete pipeline against all test files.
+    
+    Transcription and load tests run against a real server subprocess; tests
+    marked inprocess only exercise routing and validation and use the
+    in-process async_client instead.
+    """
 
-        # Expect very high success rate (allow 1-2 minor transcription variations)
-        success_rate = success_count / len(batch_files) if len(batch_files) > 0 else 0
-        assert success_rate >= 0.95, f"Batch {start_idx+1}-{end_idx} success rate too low: {success_rate:.1%} ({success_count}/{len(batch_files)}). Failures: {failures[:3]}"
+    @pytest.mark.e2e
+    @pytest.mark.xdist_group("server")
+    @pytest.mark.slow
+    @pytest.mark.parametrize("audio_file", _audio_files(), ids=lambda p: p.name)
+    async def test_audio_file_transcription(self, server_url, http_client, audio_corpus, expected_norm, audio_file):
+        """Test transcription of each audio file in tests/audio_files/."""
+        mime_type = _MIME_BY_EXT.get(audio_file.suffix.lower(), "audio/*")
+        files = {"file": (audio_file.name, audio_corpus[audio_file], mime_type)}
+        data = {"model": "whisper-1"}
+
+        response = await http_client.post(f"{server_url}/v1/audio/transcriptions", 
+                                          files=files, data=data)
+
+        assert response.status_code == status.HTTP_200_OK, \
+            f"HTTP error for {audio_file.name}: {response.status_code} {response.text}"
+
+        # Verify response structure
+        result = orjson.loads(response.content)
+        text = result.get("text")
+        if text is None or result.get("usage") is None:
+            pytest.fail(f"Missing 'text' or 'usage' field in response. Response: {result}")
+
+        # Verify transcription content (case-insensitive, flexible comparison);
+        # only the actual text needs normalizing per file
+        assert compare_transcriptions_precomputed(text, expected_norm), \
+            f"Transcription mismatch for {audio_file.name}: expected {EXPECTED_TRANSCRIPTION!r}, got {text!r}"
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_all_non_audio_files_error_handling(self, server_url):
+    @pytest.mark.inprocess
+    async def test_all_non_audio_files_error_handling(self, async_client, test_non_audio_dir):
         """Test that every file in tests/non_audio_files/ returns proper errors."""
-        non_audio_dir = Path("./tests/non_audio_files/")
-        if not non_audio_dir.exists():
-            pytest.skip("Non-audio files directory not found")
-
-        # Get all non-audio files
-        non_audio_files = list(non_audio_dir.glob("*"))
+        # A missing directory deselects this test at collection time
+        dir_path, present = test_non_audio_dir
+        non_audio_files = [dir_path / name for name in sorted(present)]
         if not non_audio_files:
             pytest.skip("No non-audio files found in test directory")
 
         success_count = 0
-        failure_count = 0
-        failures: List[Dict] = []
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for non_audio_file in non_audio_files:
-                if non_audio_file.is_file():
-                    try:
-                        with open(non_audio_file, "rb") as f:
-                            content = f.read()
+        failures: List[Failure] = []
 
-                        files = {"file": (non_audio_file.name, io.BytesIO(content), "application/octet-stream")}
-                        data = {"model": "whisper-1"}
+        for non_audio_file in non_audio_files:
+            try:
+                files = {"file": (non_audio_file.name, non_audio_file.read_bytes(), "application/octet-stream")}
+                data = {"model": "whisper-1"}
 
-                        response = await client.post(f"{server_url}/v1/audio/transcriptions", 
+                response = await async_client.post("/v1/audio/transcriptions", 
                                                    files=files, data=data)
 
-                        # Should return an error, not success
-                        if response.status_code in [
-                            status.HTTP_400_BAD_REQUEST,
-                            status.HTTP_422_UNPROCESSABLE_ENTITY,
-                            status.HTTP_500_INTERNAL_SERVER_ERROR
-                        ]:
-                            result = response.json()
-                            if "error" in result:
-                                success_count += 1
-                            else:
-                                failure_count += 1
-                                failures.append({
-                                    "file": non_audio_file.name,
-                                    "reason": "Error response missing 'error' field",
-                                    "response": result
-                                })
-                        else:
-                            failure_count += 1
-                            failures.append({
-                                "file": non_audio_file.name,
-                                "status_code": response.status_code,
-                                "reason": "Unexpected status code (should be error)",
-                                "response": response.text
-                            })
-
-                    except Exception as e:
-                        failure_count += 1
-                        failures.append({
-                            "file": non_audio_file.name,
-                            "error": str(e),
-                            "reason": "Exception during test"
-                        })
+                # Should return an error, not success
+                if response.status_code in [
+                    status.HTTP_400_BAD_REQUEST,
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR
+                ]:
+                    result = response.json()
+                    if "error" in result:
+                        success_count += 1
+                    else:
+                        failures.append(Failure(
+                            file=non_audio_file.name,
+                            reason="Error response missing 'error' field",
+                            response=result,
+                        ))
+                else:
+                    failures.append(Failure(
+                        file=non_audio_file.name,
+                        reason="Unexpected status code (should be error)",
+                        status_code=response.status_code,
+                        response=response.text,
+                    ))
+
+            except Exception as e:
+                failures.append(Failure(
+                    file=non_audio_file.name,
+                    reason="Exception during test",
+                    error=str(e),
+                ))
 
         # Report results
         total_files = len(non_audio_files)
         print(f"\nNon-audio file test results:")
         print(f"Total files: {total_files}")
         print(f"Properly handled errors: {success_count}")
-        print(f"Failed to handle: {failure_count}")
+        print(f"Failed to handle: {len(failures)}")
 
         if failures:
             print(f"\nFailures:")
             for failure in failures:
-                print(f"  {failure['file']}: {failure['reason']}")
+                print(f"  {failure.file}: {failure.reason}")
 
         # All non-audio files should return proper errors
-        assert failure_count == 0, f"Some non-audio files were not handled properly: {failures}"
+        assert not failures, f"Some non-audio files were not handled properly: {failures}"
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_server_endpoints_health(self, server_url):
+    @pytest.mark.inprocess
+    async def test_server_endpoints_health(self, async_client):
         """Test that all server endpoints are working."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Test health endpoint
-            response = await client.get(f"{server_url}/health")
-            assert response.status_code == status.HTTP_200_OK
-
-            # Test models list endpoint
-            response = await client.get(f"{server_url}/v1/models")
-            assert response.status_code == status.HTTP_200_OK
-            result = response.json()
-            assert "data" in result
-            assert len(result["data"]) == 4
-
-            # Test specific model info
-            response = await client.get(f"{server_url}/v1/models/whisper-1")
-            assert response.status_code == status.HTTP_200_OK
-            result = response.json()
-            assert result["id"] == "whisper-1"
-
-            # Test non-existent model
-            response = await client.get(f"{server_url}/v1/models/non-existent")
-            assert response.status_code == status.HTTP_404_NOT_FOUND
+        # Test health endpoint
+        response = await async_client.get("/health")
+        assert response.status_code == status.HTTP_200_OK
+
+        # Test models list endpoint
+        response = await async_client.get("/v1/models")
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert "data" in result
+        assert len(result["data"]) == 4
+
+        # Test specific model info
+        response = await async_client.get("/v1/models/whisper-1")
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert result["id"] == "whisper-1"
+
+        # Test non-existent model
+        response = await async_client.get("/v1/models/non-existent")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_different_model_aliases(self, server_url):
+    @pytest.mark.xdist_group("server")
+    async def test_different_model_aliases(self, server_url, http_client, audio_corpus):
         """Test that all model aliases work with the same backend."""
-        audio_dir = Path("./tests/audio_files/")
-        if not audio_dir.exists():
-            pytest.skip("Audio files directory not found")
-
         # Find a test audio file
-        audio_file = None
-        for pattern in ["test_wav_16000Hz_mono.wav", "*.wav", "*.mp3"]:
-            files = list(audio_dir.glob(pattern))
-            if files:
-                audio_file = files[0]
-                break
+        audio_file = AUDIO_DIR / "test_wav_16000Hz_mono.wav"
+        if audio_file not in audio_corpus:
+            audio_file = next((p for p in audio_corpus if p.suffix in (".wav", ".mp3")), None)
 
         if not audio_file:
             pytest.skip("No test audio files found")
@@ -355,56 +388,47 @@ class TestFullPipeline:
             "parakeet-tdt-0.6b-v2"
         ]
 
-        with open(audio_file, "rb") as f:
-            audio_content = f.read()
+        audio_content = audio_corpus[audio_file]
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for model in model_aliases:
-                files = {"file": (audio_file.name, io.BytesIO(audio_content), "audio/wav")}
-                data = {"model": model}
+        for model in model_aliases:
+            files = {"file": (audio_file.name, audio_content, "audio/wav")}
+            data = {"model": model}
 
-                response = await client.post(f"{server_url}/v1/audio/transcriptions", 
-                                           files=files, data=data)
+            response = await http_client.post(f"{server_url}/v1/audio/transcriptions", 
+                                              files=files, data=data)
 
-                # All models should work (they use the same backend)
-                assert response.status_code == status.HTTP_200_OK, \
-                    f"Model {model} failed with status {response.status_code}: {response.text}"
-                
-                result = response.json()
-                assert "text" in result
-                assert "usage" in result
+            # All models should work (they use the same backend)
+            assert response.status_code == status.HTTP_200_OK, \
+                f"Model {model} failed with status {response.status_code}: {response.text}"
+            
+            result = response.json()
+            assert "text" in result
+            assert "usage" in result
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_performance_under_load(self, server_url):
+    @pytest.mark.xdist_group("server")
+    async def test_performance_under_load(self, server_url, http_client, audio_corpus):
         """Test server performance with multiple concurrent requests."""
-        audio_dir = Path("./tests/audio_files/")
-        if not audio_dir.exists():
-            pytest.skip("Audio files directory not found")
-
         # Find a small test file
-        audio_file = None
-        for pattern in ["test_wav_16000Hz_mono.wav", "*.wav"]:
-            files = list(audio_dir.glob(pattern))
-            if files:
-                audio_file = files[0]
-                break
+        audio_file = AUDIO_DIR / "test_wav_16000Hz_mono.wav"
+        if audio_file not in audio_corpus:
+            audio_file = next((p for p in audio_corpus if p.suffix == ".wav"), None)
 
         if not audio_file:
             pytest.skip("No test audio files found")
 
-        with open(audio_file, "rb") as f:
-            audio_content = f.read()
+        # Every task shares the cached bytes and form data; only the name differs
+        audio_content = audio_corpus[audio_file]
+        data = {"model": "whisper-1"}
 
         async def make_request(client, request_id):
             """Make a single transcription request."""
-            files = {"file": (f"test_{request_id}.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
+            files = {"file": (f"test_{request_id}.wav", audio_content, "audio/wav")}
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = await client.post(f"{server_url}/v1/audio/transcriptions", 
-                                       files=files, data=data)
-            end_time = time.time()
+                                         files=files, data=data)
+            end_time = time.perf_counter()
             
             return {
                 "request_id": request_id,
@@ -413,77 +437,64 @@ class TestFullPipeline:
                 "success": response.status_code == status.HTTP_200_OK
             }
 
-        # Test with 5 concurrent requests
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            tasks = [make_request(client, i) for i in range(5)]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Open the pool's connections up front so the timed requests measure
+        # steady-state latency rather than TCP setup
+        await asyncio.gather(*(http_client.get(f"{server_url}/health") for _ in range(E2E_LOAD_N)))
 
-        # Analyze results
-        successful_requests = 0
-        total_time = 0
-        max_time = 0
+        # Fire E2E_LOAD_N concurrent requests through the shared pool
+        tasks = [make_request(http_client, i) for i in range(E2E_LOAD_N)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        # Analyze results
+        times = []
         for result in results:
             if isinstance(result, Exception):
                 pytest.fail(f"Request failed with exception: {result}")
             
             if result["success"]:
-                successful_requests += 1
-                total_time += result["response_time"]
-                max_time = max(max_time, result["response_time"])
+                times.append(result["response_time"])
+
+        successful_requests = len(times)
+        failed_requests = E2E_LOAD_N - successful_requests
+        
+        # Most requests should succeed
+        assert successful_requests >= 0.8 * E2E_LOAD_N, f"Too many failed requests: {failed_requests}"
+
+        p50 = statistics.median(times)
+        p95 = statistics.quantiles(times, n=20, method="inclusive")[-1] if len(times) > 1 else times[0]
 
         print(f"\nPerformance test results:")
-        print(f"Successful requests: {successful_requests}/5")
-        print(f"Average response time: {total_time/successful_requests:.2f}s")
-        print(f"Max response time: {max_time:.2f}s")
+        print(f"Successful requests: {successful_requests}/{E2E_LOAD_N}")
+        print(f"p50 response time: {p50:.2f}s")
+        print(f"p95 response time: {p95:.2f}s")
+        print(f"Max response time: {max(times):.2f}s")
 
-        # Most requests should succeed
-        assert successful_requests >= 4, f"Too many failed requests: {5 - successful_requests}"
-        
-        # Response times should be reasonable (under 30 seconds per request)
-        assert max_time < 30, f"Response time too slow: {max_time:.2f}s"
+        # Tail latency should be reasonable (under 30 seconds per request)
+        assert p95 < 30, f"p95 response time too slow: {p95:.2f}s"
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_file_format_edge_cases(self, server_url):
+    @pytest.mark.inprocess
+    @pytest.mark.parametrize("test_case", EDGE_CASES, ids=lambda c: c["filename"])
+    async def test_file_format_edge_cases(self, async_client, test_case):
         """Test edge cases with file formats and content."""
-        test_cases = [
-            # Empty file
-            {"filename": "empty.wav", "content": b"", "should_fail": True},
-            
-            # Very small file
-            {"filename": "tiny.wav", "content": b"fake", "should_fail": True},
-            
-            # File with wrong extension
-            {"filename": "notaudio.wav", "content": b"This is not audio content", "should_fail": True},
-            
-            # Invalid extension  
-            {"filename": "test.xyz", "content": b"content", "should_fail": True},
-            
-            # No extension
-            {"filename": "noextension", "content": b"content", "should_fail": True},
-        ]
+        files = {"file": (test_case["filename"], test_case["content"], "application/octet-stream")}
+        data = {"model": "whisper-1"}
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for test_case in test_cases:
-                files = {"file": (test_case["filename"], io.BytesIO(test_case["content"]), "application/octet-stream")}
-                data = {"model": "whisper-1"}
-
-                response = await client.post(f"{server_url}/v1/audio/transcriptions", 
+        response = await async_client.post("/v1/audio/transcriptions", 
                                            files=files, data=data)
 
-                if test_case["should_fail"]:
-                    # Should return an error
-                    assert response.status_code in [
-                        status.HTTP_400_BAD_REQUEST,
-                        status.HTTP_422_UNPROCESSABLE_ENTITY, 
-                        status.HTTP_500_INTERNAL_SERVER_ERROR
-                    ], f"Expected error for {test_case['filename']}, got {response.status_code}"
-                    
-                    if response.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR:
-                        result = response.json()
-                        assert "error" in result, f"Missing error field for {test_case['filename']}"
-                else:
-                    # Should succeed
-                    assert response.status_code == status.HTTP_200_OK, \
-                        f"Expected success for {test_case['filename']}, got {response.status_code}"
\ No newline at end of file
+        if test_case["should_fail"]:
+            # Should return an error
+            assert response.status_code in [
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_422_UNPROCESSABLE_ENTITY, 
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            ], f"Expected error for {test_case['filename']}, got {response.status_code}"
+            
+            if response.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR:
+                result = response.json()
+                assert "error" in result, f"Missing error field for {test_case['filename']}"
+        else:
+            # Should succeed
+            assert response.status_code == status.HTTP_200_OK, \
+                f"Expected success for {test_case['filename']}, got {response.status_code}"
@@ -1,342 +1,188 @@
 """End-to-end tests for transcription workflow with real audio files."""
 
-import io
 from pathlib import Path
-from unittest.mock import PropertyMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi import status
 
 from src.services import transcription_service
-from src.utils.validators import compare_transcriptions
+from src.utils.validators import compare_transcriptions_precomputed, normalize_transcription
+
+
+# Representative files for each format family
+REAL_AUDIO_FILES = [
+    "test_wav_16000Hz_mono.wav",
+    "test_mp3_16000Hz_mono.mp3",
+    "test_flac_8000Hz_mono.flac",
+    "test_m4a_16000Hz_mono.m4a",
+]
+
+SAMPLE_RATE_FILES = [
+    "test_wav_8000Hz_mono.wav",
+    "test_wav_16000Hz_mono.wav",
+    "test_wav_24000Hz_mono.wav",
+    "test_wav_48000Hz_mono.wav",
+]
+
+CHANNEL_FILES = [
+    "test_wav_16000Hz_mono.wav",
+    "test_wav_16000Hz_stereo.wav",
+]
+
+BIT_DEPTH_FILES = [
+    "test_wav_16000Hz_mono_16bit.wav",
+    "test_wav_16000Hz_mono_32bit.wav",
+]
+
+# Map of extensions to MIME types
+FORMAT_MIMES = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+    ".ogg": "audio/ogg",
+    ".webm": "audio/webm",
+    ".mp4": "video/mp4",
+    ".mpeg": "audio/mpeg",
+    ".mpga": "audio/mpeg",
+}
+
+# One 16 kHz mono sample per supported format
+FORMAT_FILES = [f"test_{ext[1:]}_16000Hz_mono{ext}" for ext in FORMAT_MIMES]
+
+# Every file above posted exactly once, in first-seen order
+ALL_UNIQUE_CASES = [
+    pytest.param(filename, FORMAT_MIMES[Path(filename).suffix], id=filename)
+    for filename in dict.fromkeys(
+        REAL_AUDIO_FILES + SAMPLE_RATE_FILES + CHANNEL_FILES + BIT_DEPTH_FILES + FORMAT_FILES
+    )
+]
+
+# Header-only 16 kHz mono 16-bit WAV. Tests that mock the model post this instead
+# of a real file; it is decoded in memory, so no disk or FFmpeg work is involved
+STUB_WAV = (
+    b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00"
+    b"\x80>\x00\x00\x00}\x00\x00\x02\x00\x10\x00data\x00\x00\x00\x00"
+)
+
+# All supported model aliases
+MODEL_ALIASES = [
+    "whisper-1",
+    "gpt-4o-transcribe",
+    "gpt-4o-mini-transcribe",
+    "parakeet-tdt-0.6b-v2",
+]
 
 
 class TestE2ETranscription:
     """End-to-end transcription tests with test audio files."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def expected_transcription(self):
         """Expected transcription text for test files."""
         return "The quick brown fox jumped over the lazy dog"
 
-    @pytest.mark.e2e
-    @pytest.mark.slow
-    @pytest.mark.asyncio
-    async def test_transcribe_real_audio_files(self, async_client, test_audio_dir, expected_transcription):
-        """Test transcription with real audio files from test directory."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        # Mock the model manager and transcription to return expected text
-        # Since we don't have the actual model loaded in tests
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Test different audio formats
-            test_files = [
-                "test_wav_16000Hz_mono.wav",
-                "test_mp3_16000Hz_mono.mp3", 
-                "test_flac_8000Hz_mono.flac",
-                "test_m4a_16000Hz_mono.m4a",
-            ]
-            
-            for filename in test_files:
-                file_path = test_audio_dir / filename
-                if not file_path.exists():
-                    continue
-                    
-                with open(file_path, "rb") as f:
-                    audio_content = f.read()
-                
-                files = {"file": (filename, io.BytesIO(audio_content), "audio/*")}
-                data = {"model": "whisper-1"}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for {filename}"
-                result = response.json()
-                
-                assert "text" in result
-                # Use our comparison function to handle variations
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False), \
-                    f"Transcription mismatch for {filename}. Got: {result['text']}"
-
-    @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcribe_various_sample_rates(self, async_client, test_audio_dir, expected_transcription):
-        """Test transcription with different sample rates."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Test files with different sample rates
-            sample_rate_files = [
-                "test_wav_8000Hz_mono.wav",
-                "test_wav_16000Hz_mono.wav",
-                "test_wav_24000Hz_mono.wav",
-                "test_wav_48000Hz_mono.wav",
-            ]
-            
-            for filename in sample_rate_files:
-                file_path = test_audio_dir / filename
-                if not file_path.exists():
-                    continue
-                
-                with open(file_path, "rb") as f:
-                    audio_content = f.read()
-                
-                files = {"file": (filename, io.BytesIO(audio_content), "audio/wav")}
-                data = {"model": "whisper-1"}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for {filename}"
-                result = response.json()
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False)
-
-    @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcribe_stereo_vs_mono(self, async_client, test_audio_dir, expected_transcription):
-        """Test transcription with stereo vs mono files."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
+    @pytest.fixture(scope="class")
+    def expected_normalized(self, expected_transcription):
+        """Normalized expected transcription, computed once for the class."""
+        return normalize_transcription(expected_transcription)
 
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Test mono vs stereo
-            channel_files = [
-                "test_wav_16000Hz_mono.wav",
-                "test_wav_16000Hz_stereo.wav",
-            ]
-            
-            for filename in channel_files:
-                file_path = test_audio_dir / filename
-                if not file_path.exists():
-                    continue
-                
-                with open(file_path, "rb") as f:
-                    audio_content = f.read()
-                
-                files = {"file": (filename, io.BytesIO(audio_content), "audio/wav")}
-                data = {"model": "whisper-1"}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for {filename}"
-                result = response.json()
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False)
-
-    @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcribe_different_bit_depths(self, async_client, test_audio_dir, expected_transcription):
-        """Test transcription with different bit depths."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Test different bit depths
-            bit_depth_files = [
-                "test_wav_16000Hz_mono_16bit.wav",
-                "test_wav_16000Hz_mono_32bit.wav",
-            ]
-            
-            for filename in bit_depth_files:
-                file_path = test_audio_dir / filename
-                if not file_path.exists():
-                    continue
-                
-                with open(file_path, "rb") as f:
-                    audio_content = f.read()
-                
-                files = {"file": (filename, io.BytesIO(audio_content), "audio/wav")}
-                data = {"model": "whisper-1"}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for {filename}"
-                result = response.json()
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False)
+    @pytest.fixture
+    def mocked_model(self, monkeypatch, expected_transcription):
+        """Mock the model manager to report loaded and return the expected text.
+        
+        The actual model is not loaded in tests. Concurrent requests may be
+        batched into one call, so the mock answers once per input.
+        """
+        manager = transcription_service.model_manager
+        # Set the flag behind is_loaded rather than swapping the property for a PropertyMock
+        monkeypatch.setattr(manager, "_is_loaded", True)
+        mock_transcribe = MagicMock(side_effect=lambda audio, **kwargs: [expected_transcription] * len(audio))
+        monkeypatch.setattr(manager, "transcribe", mock_transcribe)
+        return mock_transcribe
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcribe_all_supported_formats(self, async_client, test_audio_dir, expected_transcription):
-        """Test transcription with all supported audio formats."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Map of extensions to MIME types
-            format_mimes = {
-                ".wav": "audio/wav",
-                ".mp3": "audio/mpeg",
-                ".flac": "audio/flac",
-                ".m4a": "audio/mp4",
-                ".ogg": "audio/ogg",
-                ".webm": "audio/webm",
-                ".mp4": "video/mp4",
-                ".mpeg": "audio/mpeg",
-                ".mpga": "audio/mpeg",
-            }
-            
-            # Find all audio files in test directory
-            audio_files = []
-            for ext in format_mimes.keys():
-                audio_files.extend(test_audio_dir.glob(f"*{ext}"))
-            
-            if not audio_files:
-                pytest.skip("No test audio files found")
-            
-            for file_path in audio_files[:5]:  # Limit to first 5 files for speed
-                with open(file_path, "rb") as f:
-                    audio_content = f.read()
-                
-                mime_type = format_mimes.get(file_path.suffix.lower(), "audio/*")
-                files = {"file": (file_path.name, io.BytesIO(audio_content), mime_type)}
-                data = {"model": "whisper-1"}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for {file_path.name}"
-                result = response.json()
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False)
+    @pytest.mark.parametrize("filename,mime", ALL_UNIQUE_CASES)
+    async def test_transcribe_audio_file(self, async_client, mocked_model, test_audio_dir, audio_bytes_cache, expected_normalized, filename, mime):
+        """Test transcription across formats, sample rates, channels and bit depths."""
+        file_path = test_audio_dir / filename
+        if not file_path.exists():
+            pytest.skip(f"Test audio file not found: {filename}")
+
+        files = {"file": (filename, audio_bytes_cache(file_path), mime)}
+        data = {"model": "whisper-1"}
+        
+        response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
+        
+        # Status first, so error bodies are never parsed as transcriptions
+        assert response.status_code == status.HTTP_200_OK, f"Failed for {filename}"
+        text = response.json().get("text")
+        
+        assert text is not None, f"No 'text' field for {filename}"
+        # Use our comparison function to handle variations
+        assert compare_transcriptions_precomputed(text, expected_normalized), \
+            f"Transcription mismatch for {filename}. Got: {text}"
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcribe_with_different_models(self, async_client, test_audio_dir, expected_transcription):
+    @pytest.mark.parametrize("model", MODEL_ALIASES)
+    async def test_transcribe_with_different_models(self, async_client, mocked_model, expected_normalized, model):
         """Test transcription with different model aliases."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        # Find a test audio file
-        audio_file = None
-        for pattern in ["*.wav", "*.mp3", "*.flac"]:
-            files = list(test_audio_dir.glob(pattern))
-            if files:
-                audio_file = files[0]
-                break
+        files = {"file": ("stub.wav", STUB_WAV, "audio/wav")}
+        data = {"model": model}
         
-        if not audio_file:
-            pytest.skip("No test audio files found")
-
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # Test all supported model aliases
-            models = [
-                "whisper-1",
-                "gpt-4o-transcribe",
-                "gpt-4o-mini-transcribe",
-                "parakeet-tdt-0.6b-v2"
-            ]
-            
-            with open(audio_file, "rb") as f:
-                audio_content = f.read()
-            
-            for model in models:
-                files = {"file": (audio_file.name, io.BytesIO(audio_content), "audio/*")}
-                data = {"model": model}
-                
-                response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                
-                assert response.status_code == status.HTTP_200_OK, f"Failed for model {model}"
-                result = response.json()
-                assert compare_transcriptions(result["text"], expected_transcription, strict=False)
+        response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
+        
+        assert response.status_code == status.HTTP_200_OK, f"Failed for model {model}"
+        result = response.json()
+        assert compare_transcriptions_precomputed(result["text"], expected_normalized)
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_complete_api_workflow(self, async_client, test_audio_dir, expected_transcription):
+    async def test_complete_api_workflow(self, async_client, mocked_model, expected_normalized):
         """Test complete API workflow: models list, model info, transcription."""
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            # 1. List available models
-            response = await async_client.get("/v1/models")
-            assert response.status_code == status.HTTP_200_OK
-            models_data = response.json()
-            assert len(models_data["data"]) == 4
-            
-            # 2. Get info for a specific model
-            response = await async_client.get("/v1/models/whisper-1")
-            assert response.status_code == status.HTTP_200_OK
-            model_info = response.json()
-            assert model_info["id"] == "whisper-1"
-            
-            # 3. Transcribe audio (if test files available)
-            if test_audio_dir.exists():
-                audio_files = list(test_audio_dir.glob("*.wav"))
-                if audio_files:
-                    audio_file = audio_files[0]
-                    with open(audio_file, "rb") as f:
-                        audio_content = f.read()
-                    
-                    files = {"file": (audio_file.name, io.BytesIO(audio_content), "audio/wav")}
-                    data = {"model": "whisper-1"}
-                    
-                    response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-                    assert response.status_code == status.HTTP_200_OK
-                    result = response.json()
-                    assert compare_transcriptions(result["text"], expected_transcription, strict=False)
+        # 1. List available models
+        response = await async_client.get("/v1/models")
+        assert response.status_code == status.HTTP_200_OK
+        models_data = response.json()
+        assert len(models_data["data"]) == 4
+        
+        # 2. Get info for a specific model
+        response = await async_client.get("/v1/models/whisper-1")
+        assert response.status_code == status.HTTP_200_OK
+        model_info = response.json()
+        assert model_info["id"] == "whisper-1"
+        
+        # 3. Transcribe audio
+        files = {"file": ("stub.wav", STUB_WAV, "audio/wav")}
+        data = {"model": "whisper-1"}
+        
+        response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        assert compare_transcriptions_precomputed(result["text"], expected_normalized)
 
     @pytest.mark.e2e
-    @pytest.mark.asyncio
-    async def test_transcription_response_format(self, async_client, test_audio_dir, expected_transcription):
+    async def test_transcription_response_format(self, async_client, mocked_model):
         """Test transcription response follows OpenAI format exactly."""
-        if not test_audio_dir.exists():
-            pytest.skip("Test audio directory not found")
-
-        audio_files = list(test_audio_dir.glob("*.wav"))
-        if not audio_files:
-            pytest.skip("No WAV test files found")
-
-        with patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe:
-            
-            mock_transcribe.return_value = [expected_transcription]
-            
-            audio_file = audio_files[0]
-            with open(audio_file, "rb") as f:
-                audio_content = f.read()
-            
-            files = {"file": (audio_file.name, io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_200_OK
-            result = response.json()
-            
-            # Verify exact OpenAI response format
-            assert "text" in result
-            assert "usage" in result
-            
-            usage = result["usage"]
-            assert usage["type"] == "tokens"
-            assert usage["input_tokens"] == 1
-            assert usage["output_tokens"] == 1
-            assert usage["total_tokens"] == 2
-            
-            assert "input_token_details" in usage
-            token_details = usage["input_token_details"]
-            assert token_details["text_tokens"] == 0
-            assert token_details["audio_tokens"] == 1
\ No newline at end of file
+        files = {"file": ("stub.wav", STUB_WAV, "audio/wav")}
+        data = {"model": "whisper-1"}
+        
+        response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
+        
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()
+        
+        # Verify exact OpenAI response format
+        assert "text" in result
+        assert "usage" in result
+        
+        usage = result["usage"]
+        assert usage["type"] == "tokens"
+        assert usage["input_tokens"] == 1
+        assert usage["output_tokens"] == 1
+        assert usage["total_tokens"] == 2
+        
+        assert "input_token_details" in usage
+        token_details = usage["input_token_details"]
+        assert token_details["text_tokens"] == 0
+        assert token_details["audio_tokens"] == 1
\ No newline at end of file
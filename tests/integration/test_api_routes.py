@@ -1,221 +1,199 @@
 """Integration tests for API routes."""
 
-import io
-from unittest.mock import AsyncMock, PropertyMock, patch
+import inspect
+import threading
+from unittest.mock import patch
 
+import httpx
+import orjson
 import pytest
 from fastapi import status
+from fastapi.routing import APIRoute
 
+from src.api import models_router, transcription_router
+from src.core import model_manager
 from src.core.exceptions import (
     AudioProcessingError,
     AudioValidationError,
     ModelError,
     ModelNotLoadedError,
 )
+from src.core.monitoring import system_monitor
+from src.main import app
+from src.models import TranscriptionResponse
+from src.services import transcription_service
+
+
+# httpx sends raw bytes as the multipart body without consuming them
+AUDIO_CONTENT = b"fake audio content"
+
+# Form data shared by requests that only set the model; never mutated
+DATA_WHISPER = {"model": "whisper-1"}
+
+
+def _json(response) -> dict:
+    """Decode a response body with orjson."""
+    return orjson.loads(response.content)
+
+
+def _data(**overrides) -> dict:
+    """Build form data from DATA_WHISPER with the given fields added or replaced."""
+    return {**DATA_WHISPER, **overrides}
+
+
+def _files(name: str = "test.wav") -> dict:
+    """Build the multipart files mapping for a fake WAV upload."""
+    return {"file": (name, AUDIO_CONTENT, "audio/wav")}
+
+
+# The default upload (test.wav, model whisper-1) encoded to multipart once
+_DEFAULT_UPLOAD = httpx.Request(
+    "POST", "http://test/v1/audio/transcriptions", files=_files(), data=DATA_WHISPER
+)
+DEFAULT_UPLOAD_BODY = _DEFAULT_UPLOAD.read()
+DEFAULT_UPLOAD_HEADERS = {"content-type": _DEFAULT_UPLOAD.headers["content-type"]}
+
+
+async def _post_default_upload(client):
+    """Post the pre-encoded default upload to the transcription endpoint."""
+    return await client.post(
+        "/v1/audio/transcriptions", content=DEFAULT_UPLOAD_BODY, headers=DEFAULT_UPLOAD_HEADERS
+    )
 
 
 class TestTranscriptionAPI:
     """Test transcription API integration."""
 
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_success(self, async_client):
-        """Test successful audio transcription."""
-        # Mock the transcription service
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            from src.models import TranscriptionResponse
-            mock_transcribe.return_value = TranscriptionResponse(
-                text="The quick brown fox jumped over the lazy dog."
-            )
-            
-            # Create test file
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
+    @pytest.fixture
+    def stub_transcribe(self, monkeypatch):
+        """Fixture to replace the transcription service call with a plain coroutine."""
+        def _stub_transcribe(result=None, error=None):
+            async def fake(*args, **kwargs):
+                if error is not None:
+                    raise error
+                return result
             
-            assert response.status_code == status.HTTP_200_OK
-            result = response.json()
-            
-            assert "text" in result
-            assert result["text"] == "The quick brown fox jumped over the lazy dog."
-            assert "usage" in result
-            assert result["usage"]["input_tokens"] == 1
-            assert result["usage"]["output_tokens"] == 1
-            assert result["usage"]["total_tokens"] == 2
-
-    @pytest.mark.asyncio
+            monkeypatch.setattr(transcription_service, "transcribe_audio", fake)
+        
+        return _stub_transcribe
+
+    async def test_transcribe_audio_success(self, async_client, stub_transcribe):
+        """Test successful audio transcription."""
+        stub_transcribe(result=TranscriptionResponse(
+            text="The quick brown fox jumped over the lazy dog."
+        ))
+        
+        response = await _post_default_upload(async_client)
+        
+        assert response.status_code == status.HTTP_200_OK
+        result = _json(response)
+        
+        assert "text" in result
+        assert result["text"] == "The quick brown fox jumped over the lazy dog."
+        assert "usage" in result
+        assert result["usage"]["input_tokens"] == 1
+        assert result["usage"]["output_tokens"] == 1
+        assert result["usage"]["total_tokens"] == 2
+
     async def test_transcribe_audio_no_file(self, async_client):
         """Test transcription without file."""
-        data = {"model": "whisper-1"}
+        data = DATA_WHISPER
         
         response = await async_client.post("/v1/audio/transcriptions", data=data)
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    @pytest.mark.asyncio
     async def test_transcribe_audio_no_filename(self, async_client):
         """Test transcription without filename."""
-        audio_content = b"fake audio content"
-        files = {"file": ("", io.BytesIO(audio_content), "audio/wav")}
-        data = {"model": "whisper-1"}
+        files = _files("")
+        data = DATA_WHISPER
         
         response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
-    @pytest.mark.asyncio
     async def test_transcribe_audio_invalid_language(self, async_client):
         """Test transcription with invalid language."""
-        audio_content = b"fake audio content"
-        files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-        data = {"model": "whisper-1", "language": "fr"}
+        files = _files()
+        data = _data(language="fr")
         
         response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        result = response.json()
+        result = _json(response)
         assert "error" in result
         assert "Only English" in result["error"]["message"]
 
-    @pytest.mark.asyncio
     async def test_transcribe_audio_invalid_response_format(self, async_client):
         """Test transcription with invalid response format."""
-        audio_content = b"fake audio content"
-        files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-        data = {"model": "whisper-1", "response_format": "text"}
+        files = _files()
+        data = _data(response_format="text")
         
         response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        result = response.json()
+        result = _json(response)
         assert "error" in result
         assert "Only 'json' format" in result["error"]["message"]
 
-    @pytest.mark.asyncio
     async def test_transcribe_audio_streaming_error(self, async_client):
         """Test transcription with streaming for OpenAI models."""
-        audio_content = b"fake audio content"
-        files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-        data = {"model": "gpt-4o-transcribe", "stream": "true"}
+        files = _files()
+        data = _data(model="gpt-4o-transcribe", stream="true")
         
         response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        result = response.json()
+        result = _json(response)
         assert "error" in result
         assert "not supported for model" in result["error"]["message"]
 
-    @pytest.mark.asyncio
     async def test_transcribe_audio_timestamp_granularities_error(self, async_client):
         """Test transcription with timestamp granularities."""
-        audio_content = b"fake audio content"
-        files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-        data = {"model": "whisper-1", "timestamp_granularities": '["word"]'}
+        files = _files()
+        data = _data(timestamp_granularities='["word"]')
         
         response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        result = response.json()
+        result = _json(response)
         assert "error" in result
         assert "not supported" in result["error"]["message"]
 
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_validation_error(self, async_client):
-        """Test transcription with audio validation error."""
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            mock_transcribe.side_effect = AudioValidationError("Invalid audio format")
-            
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_400_BAD_REQUEST
-            result = response.json()
-            assert "error" in result
-            assert "Invalid audio format" in result["error"]["message"]
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_processing_error(self, async_client):
-        """Test transcription with audio processing error."""
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            mock_transcribe.side_effect = AudioProcessingError("Processing failed")
-            
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            result = response.json()
-            assert "error" in result
-            assert "Processing failed" in result["error"]["message"]
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_model_not_loaded(self, async_client):
-        """Test transcription when model not loaded."""
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            mock_transcribe.side_effect = ModelNotLoadedError()
-            
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
-            result = response.json()
-            assert "error" in result
-            assert "Model is not loaded" in result["error"]["message"]
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_model_error(self, async_client):
-        """Test transcription with model error."""
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            mock_transcribe.side_effect = ModelError("Inference failed")
-            
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            result = response.json()
-            assert "error" in result
-            assert "Inference failed" in result["error"]["message"]
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_unexpected_error(self, async_client):
-        """Test transcription with unexpected error."""
-        with patch('src.services.transcription_service.transcribe_audio') as mock_transcribe:
-            mock_transcribe.side_effect = Exception("Unexpected error")
-            
-            audio_content = b"fake audio content"
-            files = {"file": ("test.wav", io.BytesIO(audio_content), "audio/wav")}
-            data = {"model": "whisper-1"}
-            
-            response = await async_client.post("/v1/audio/transcriptions", files=files, data=data)
-            
-            assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            result = response.json()
-            assert "error" in result
-            assert "An unexpected error occurred" in result["error"]["message"]
-
+    @pytest.mark.parametrize("error,status_code,message", [
+        pytest.param(AudioValidationError("Invalid audio format"), status.HTTP_400_BAD_REQUEST, "Invalid audio format", id="validation_error"),
+        pytest.param(AudioProcessingError("Processing failed"), status.HTTP_500_INTERNAL_SERVER_ERROR, "Processing failed", id="processing_error"),
+        pytest.param(ModelNotLoadedError(), status.HTTP_503_SERVICE_UNAVAILABLE, "Model is not loaded", id="model_not_loaded"),
+        pytest.param(ModelError("Inference failed"), status.HTTP_500_INTERNAL_SERVER_ERROR, "Inference failed", id="model_error"),
+        pytest.param(Exception("Unexpected error"), status.HTTP_500_INTERNAL_SERVER_ERROR, "An unexpected error occurred", id="unexpected_error"),
+    ])
+    async def test_transcribe_audio_service_errors(self, async_client, stub_transcribe, error, status_code, message):
+        """Test service exceptions map to the right status and error message."""
+        stub_transcribe(error=error)
+        
+        response = await _post_default_upload(async_client)
+        
+        assert response.status_code == status_code
+        result = _json(response)
+        assert "error" in result
+        assert message in result["error"]["message"]
 
 class TestModelsAPI:
     """Test models API integration."""
 
-    @pytest.mark.asyncio
+    def test_handlers_are_async(self):
+        """Test every route handler is a coroutine, so none runs in the threadpool."""
+        routes = [*app.routes, *models_router.routes, *transcription_router.routes]
+        for route in routes:
+            if isinstance(route, APIRoute):
+                assert inspect.iscoroutinefunction(route.endpoint), f"{route.path} handler is sync"
+
     async def test_list_models(self, async_client):
         """Test listing models."""
         response = await async_client.get("/v1/models")
         
         assert response.status_code == status.HTTP_200_OK
-        result = response.json()
+        result = _json(response)
         
         assert "object" in result
         assert result["object"] == "list"
@@ -231,53 +209,41 @@ class TestModelsAPI:
         ]
         assert set(model_ids) == set(expected_ids)
 
-    @pytest.mark.asyncio
     async def test_get_model_existing(self, async_client):
         """Test getting existing model."""
         response = await async_client.get("/v1/models/whisper-1")
         
         assert response.status_code == status.HTTP_200_OK
-        result = response.json()
+        result = _json(response)
         
         assert result["id"] == "whisper-1"
         assert result["object"] == "model"
         assert result["created"] == 1744718400
         assert result["owned_by"] == "parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
 
-    @pytest.mark.asyncio
     async def test_get_model_nonexistent(self, async_client):
         """Test getting non-existent model."""
         response = await async_client.get("/v1/models/non-existent-model")
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
-        result = response.json()
+        result = _json(response)
         
         assert "error" in result
         assert "not found" in result["error"]["message"]
 
-    @pytest.mark.asyncio
     async def test_models_with_auth_header(self, async_client):
         """Test models endpoints with authorization header."""
         headers = {"Authorization": "Bearer fake-api-key"}
         
-        # Test list models
+        # The header is ignored; test_get_model_existing covers the detail route
         response = await async_client.get("/v1/models", headers=headers)
         assert response.status_code == status.HTTP_200_OK
-        
-        # Test get model
-        response = await async_client.get("/v1/models/whisper-1", headers=headers)
-        assert response.status_code == status.HTTP_200_OK
 
-    @pytest.mark.asyncio
     async def test_models_with_request_id(self, async_client):
         """Test models endpoints with request ID header."""
         headers = {"X-Request-ID": "test-request-123"}
         
-        # Test list models
-        response = await async_client.get("/v1/models", headers=headers)
-        assert response.status_code == status.HTTP_200_OK
-        
-        # Test get model
+        # test_list_models covers the list route without the header
         response = await async_client.get("/v1/models/whisper-1", headers=headers)
         assert response.status_code == status.HTTP_200_OK
 
@@ -285,49 +251,94 @@ class TestModelsAPI:
 class TestHealthEndpoints:
     """Test health check endpoints."""
 
-    @pytest.mark.asyncio
     async def test_root_endpoint(self, async_client):
         """Test root health endpoint."""
         response = await async_client.get("/")
         
         assert response.status_code == status.HTTP_200_OK
-        result = response.json()
+        result = _json(response)
         
         assert result["status"] == "healthy"
         assert result["service"] == "parakeetv2API"
         assert result["version"] == "0.1.0"
 
-    @pytest.mark.asyncio
-    async def test_health_endpoint(self, async_client):
+    async def test_health_endpoint(self, async_client, monkeypatch):
         """Test health check endpoint."""
-        from src.core import model_manager
-        with patch.object(model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)):
-            response = await async_client.get("/health")
-            
-            assert response.status_code == status.HTTP_200_OK
-            result = response.json()
-            
-            assert result["status"] == "healthy"
-            assert result["model_loaded"] is True
+        monkeypatch.setattr(model_manager, "_is_loaded", True)
+        response = await async_client.get("/health")
+        
+        assert response.status_code == status.HTTP_200_OK
+        result = _json(response)
+        
+        assert result["status"] == "healthy"
+        assert result["model_loaded"] is True
 
-    @pytest.mark.asyncio
-    async def test_health_endpoint_model_not_loaded(self, async_client):
+    async def test_health_endpoint_model_not_loaded(self, async_client, monkeypatch):
         """Test health check when model not loaded."""
-        from src.core import model_manager
-        with patch.object(model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=False)):
+        monkeypatch.setattr(model_manager, "_is_loaded", False)
+        response = await async_client.get("/health")
+        
+        assert response.status_code == status.HTTP_200_OK
+        result = _json(response)
+        
+        assert result["status"] == "healthy"
+        assert result["model_loaded"] is False
+
+    async def test_health_endpoint_uses_snapshot(self, async_client):
+        """Test repeated health checks reuse the latest metrics snapshot."""
+        system_monitor.check_health(max_age=0)
+        with patch.object(system_monitor, 'get_current_metrics') as mock_metrics:
             response = await async_client.get("/health")
             
             assert response.status_code == status.HTTP_200_OK
-            result = response.json()
+            mock_metrics.assert_not_called()
+
+    async def test_health_endpoint_serves_stale_snapshot_while_monitoring(self, async_client, monkeypatch):
+        """Test a running monitor's snapshot is served however old it is."""
+        system_monitor.check_health(max_age=0)
+        monkeypatch.setattr(system_monitor, "_latest_time", 0.0)
+        monkeypatch.setattr(system_monitor, "_monitoring", True)
+        with patch.object(system_monitor, 'get_current_metrics') as mock_metrics:
+            response = await async_client.get("/health")
             
-            assert result["status"] == "healthy"
-            assert result["model_loaded"] is False
+            assert response.status_code == status.HTTP_200_OK
+            mock_metrics.assert_not_called()
+
+    async def test_health_endpoint_refreshes_off_loop(self, async_client, monkeypatch):
+        """Test a stale snapshot is refreshed in a worker thread when monitoring is off."""
+        system_monitor.check_health(max_age=0)
+        monkeypatch.setattr(system_monitor, "_latest_time", 0.0)
+        loop_thread = threading.get_ident()
+        threads = []
+        real_metrics = system_monitor.get_current_metrics
+        
+        def metrics():
+            threads.append(threading.get_ident())
+            return real_metrics()
+        
+        monkeypatch.setattr(system_monitor, "get_current_metrics", metrics)
+        response = await async_client.get("/health")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(threads) == 1
+        assert threads[0] != loop_thread
+
+    async def test_openapi_schema(self, async_client):
+        """Test the pre-serialized OpenAPI schema is served."""
+        response = await async_client.get("/openapi.json")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        result = _json(response)
+        
+        assert result["info"]["title"] == "parakeetv2API"
+        assert "/v1/audio/transcriptions" in result["paths"]
+        assert "/openapi.json" not in result["paths"]
 
 
 class TestCORSAndMiddleware:
     """Test CORS and middleware functionality."""
 
-    @pytest.mark.asyncio
     async def test_cors_headers(self, async_client):
         """Test CORS headers are present."""
         response = await async_client.get("/v1/models")
@@ -336,10 +347,50 @@ class TestCORSAndMiddleware:
         assert response.status_code == status.HTTP_200_OK
         # Check that CORS middleware is working by verifying no CORS errors
 
-    @pytest.mark.asyncio
     async def test_content_type_json(self, async_client):
         """Test content type is JSON."""
         response = await async_client.get("/v1/models")
         
         assert response.status_code == status.HTTP_200_OK
-        assert "application/json" in response.headers.get("content-type", "")
\ No newline at end of file
+        assert "application/json" in response.headers.get("content-type", "")
+
+    async def test_request_id_header(self, async_client):
+        """Test request IDs are echoed or generated on every response."""
+        response = await async_client.get(
+            "/v1/models", headers={"X-Request-ID": "test-request-123"}
+        )
+        assert response.headers["x-request-id"] == "test-request-123"
+        
+        # Generated IDs are unique per request
+        first = await async_client.get("/v1/models")
+        second = await async_client.get("/v1/models")
+        assert first.headers["x-request-id"]
+        assert first.headers["x-request-id"] != second.headers["x-request-id"]
+
+    async def test_cheap_paths_skip_monitoring(self, async_client):
+        """Test health probes bypass tracing and timing middleware."""
+        response = await async_client.get("/v1/models")
+        assert "x-response-time-ms" in response.headers
+        
+        response = await async_client.get("/health")
+        assert response.status_code == status.HTTP_200_OK
+        assert "x-response-time-ms" not in response.headers
+        assert "x-request-id" not in response.headers
+
+    async def test_large_response_compressed(self, async_client):
+        """Test large responses are gzipped when the client accepts it."""
+        response = await async_client.get(
+            "/openapi.json", headers={"Accept-Encoding": "gzip"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "openapi" in _json(response)
+
+    async def test_small_response_not_compressed(self, async_client):
+        """Test small and health responses are sent uncompressed."""
+        for path in ["/", "/v1/models/whisper-1"]:
+            response = await async_client.get(path, headers={"Accept-Encoding": "gzip"})
+            
+            assert response.status_code == status.HTTP_200_OK
+            assert "content-encoding" not in response.headers
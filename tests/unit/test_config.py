@@ -9,6 +9,12 @@ from src.config import Settings
 class TestSettings:
     """Test configuration settings."""
 
+    @staticmethod
+    def _assert_invalid(**kwargs):
+        """Assert that building Settings from kwargs fails validation."""
+        with pytest.raises(ValidationError):
+            Settings(**kwargs)
+
     def test_default_settings(self):
         """Test default settings are valid."""
         settings = Settings()
@@ -17,63 +23,42 @@ class TestSettings:
         assert settings.api_prefix == "/v1"
         assert settings.model_name == "nvidia/parakeet-tdt-0.6b-v2"
 
-    def test_host_validation(self):
-        """Test host validation."""
-        # Valid hosts
-        valid_hosts = ["localhost", "127.0.0.1", "0.0.0.0"]
-        for host in valid_hosts:
-            settings = Settings(host=host)
-            assert settings.host == host
-
-        # Invalid host should raise error
-        with pytest.raises(ValidationError):
-            Settings(host="invalid.host.com")
-
-    def test_port_validation(self):
-        """Test port validation."""
-        # Valid port
-        settings = Settings(port=8080)
-        assert settings.port == 8080
-
-        # Invalid ports
-        with pytest.raises(ValidationError):
-            Settings(port=0)
-        
-        with pytest.raises(ValidationError):
-            Settings(port=70000)
-
-    def test_log_level_validation(self):
-        """Test log level validation."""
-        # Valid log levels
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        for level in valid_levels:
-            settings = Settings(log_level=level)
-            assert settings.log_level == level.upper()
-
-        # Case insensitive
-        settings = Settings(log_level="debug")
-        assert settings.log_level == "DEBUG"
-
-        # Invalid log level
-        with pytest.raises(ValidationError):
-            Settings(log_level="INVALID")
-
-    def test_log_format_validation(self):
-        """Test log format validation."""
-        # Valid formats
-        settings = Settings(log_format="json")
-        assert settings.log_format == "json"
-        
-        settings = Settings(log_format="text")
-        assert settings.log_format == "text"
-
-        # Case insensitive
-        settings = Settings(log_format="JSON")
-        assert settings.log_format == "json"
-
-        # Invalid format
-        with pytest.raises(ValidationError):
-            Settings(log_format="invalid")
+    @pytest.mark.parametrize("field,value,expected", [
+        ("host", "localhost", "localhost"),
+        ("host", "127.0.0.1", "127.0.0.1"),
+        ("host", "0.0.0.0", "0.0.0.0"),
+        ("port", 8080, 8080),
+        ("log_level", "DEBUG", "DEBUG"),
+        ("log_level", "INFO", "INFO"),
+        ("log_level", "WARNING", "WARNING"),
+        ("log_level", "ERROR", "ERROR"),
+        ("log_level", "CRITICAL", "CRITICAL"),
+        ("log_level", "debug", "DEBUG"),  # Case insensitive
+        ("log_format", "json", "json"),
+        ("log_format", "text", "text"),
+        ("log_format", "JSON", "json"),  # Case insensitive
+        ("gpu_device", 0, 0),
+        ("gpu_device", 3, 3),
+        ("max_audio_file_size", 10 * 1024 * 1024, 10 * 1024 * 1024),  # 10MB
+    ])
+    def test_valid_settings(self, field, value, expected):
+        """Test valid values are accepted and normalized."""
+        settings = Settings(**{field: value})
+        assert getattr(settings, field) == expected
+
+    @pytest.mark.parametrize("field,value", [
+        ("host", "invalid.host.com"),
+        ("port", 0),
+        ("port", 70000),
+        ("log_level", "INVALID"),
+        ("log_format", "invalid"),
+        ("gpu_device", -1),
+        ("max_audio_file_size", 0),
+        ("max_audio_file_size", -1),
+    ])
+    def test_invalid_settings(self, field, value):
+        """Test invalid values raise a validation error."""
+        self._assert_invalid(**{field: value})
 
     def test_cuda_visible_devices_property(self):
         """Test CUDA_VISIBLE_DEVICES property."""
@@ -88,28 +73,30 @@ class TestSettings:
         settings = Settings(gpu_device=0)
         assert settings.cuda_visible_devices == "0"
 
-    def test_gpu_device_validation(self):
-        """Test GPU device validation."""
-        # Valid GPU devices
-        settings = Settings(gpu_device=0)
-        assert settings.gpu_device == 0
+    def test_server_tuning_settings(self):
+        """Test server tuning settings."""
+        # Defaults leave uvicorn and CPU affinity unconstrained
+        settings = Settings()
+        assert settings.max_concurrency is None
+        assert settings.pin_cpus is None
 
-        settings = Settings(gpu_device=3)
-        assert settings.gpu_device == 3
+        settings = Settings(max_concurrency=64, pin_cpus=[0, 1])
+        assert settings.max_concurrency == 64
+        assert settings.pin_cpus == [0, 1]
 
-        # Invalid GPU device
-        with pytest.raises(ValidationError):
-            Settings(gpu_device=-1)
+        # Invalid concurrency limit
+        self._assert_invalid(max_concurrency=0)
 
-    def test_file_size_validation(self):
-        """Test file size validation."""
-        # Valid file size
-        settings = Settings(max_audio_file_size=10 * 1024 * 1024)  # 10MB
-        assert settings.max_audio_file_size == 10 * 1024 * 1024
+    def test_pipeline_settings(self):
+        """Test batching and decode stage settings."""
+        settings = Settings()
+        assert settings.max_batch_size == 8
+        assert settings.batch_wait_ms == 10.0
+        assert settings.decode_workers is None
 
-        # Invalid file size
-        with pytest.raises(ValidationError):
-            Settings(max_audio_file_size=0)
+        settings = Settings(max_batch_size=16, batch_wait_ms=0, decode_workers=4)
+        assert settings.max_batch_size == 16
+        assert settings.decode_workers == 4
 
-        with pytest.raises(ValidationError):
-            Settings(max_audio_file_size=-1)
\ No newline at end of file
+        self._assert_invalid(max_batch_size=0)
+        self._assert_invalid(decode_workers=0)
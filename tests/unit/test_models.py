@@ -1,11 +1,16 @@
 """Unit tests for Pydantic models."""
 
+import dataclasses
+
 import pytest
 from pydantic import ValidationError
 
 from src.core.exceptions import UnsupportedParameterError
 from src.models import (
+    AVAILABLE_MODEL_IDS,
     AVAILABLE_MODELS,
+    FIXED_USAGE,
+    FIXED_USAGE_DICT,
     ModelInfo,
     ModelListResponse,
     TranscriptionRequest,
@@ -16,6 +21,41 @@ from src.models import (
     get_model_list,
 )
 
+_EXPECTED_MODEL_IDS = frozenset({
+    "gpt-4o-transcribe",
+    "gpt-4o-mini-transcribe",
+    "parakeet-tdt-0.6b-v2",
+    "whisper-1",
+})
+
+
+@pytest.fixture(scope="module")
+def default_request():
+    """Shared request built from default values."""
+    return TranscriptionRequest()
+
+
+@pytest.fixture(scope="module")
+def valid_en_request():
+    """Shared valid English request for an OpenAI model alias."""
+    return TranscriptionRequest(
+        model="gpt-4o-transcribe",
+        language="en",
+        response_format="json"
+    )
+
+
+@pytest.fixture(scope="module")
+def whisper_stream_request():
+    """Shared streaming request for whisper-1."""
+    return TranscriptionRequest(model="whisper-1", stream=True)
+
+
+@pytest.fixture(scope="module")
+def hello_response():
+    """Shared response with basic text."""
+    return TranscriptionResponse(text="Hello world")
+
 
 class TestTokenUsageDetails:
     """Test token usage details model."""
@@ -39,12 +79,11 @@ class TestTokenUsage:
     def test_default_values(self):
         """Test default values."""
         usage = TokenUsage()
-        assert usage.type == "tokens"
-        assert usage.input_tokens == 1
-        assert usage.output_tokens == 1
-        assert usage.total_tokens == 2
-        assert usage.input_token_details.text_tokens == 0
-        assert usage.input_token_details.audio_tokens == 1
+        details = usage.input_token_details
+        assert (
+            usage.type, usage.input_tokens, usage.output_tokens, usage.total_tokens,
+            details.text_tokens, details.audio_tokens,
+        ) == ("tokens", 1, 1, 2, 0, 1)
 
     def test_custom_values(self):
         """Test custom values."""
@@ -55,50 +94,42 @@ class TestTokenUsage:
             total_tokens=15,
             input_token_details=details
         )
-        assert usage.input_tokens == 5
-        assert usage.output_tokens == 10
-        assert usage.total_tokens == 15
-        assert usage.input_token_details.text_tokens == 2
-        assert usage.input_token_details.audio_tokens == 3
+        assert (
+            usage.input_tokens, usage.output_tokens, usage.total_tokens,
+            usage.input_token_details.text_tokens, usage.input_token_details.audio_tokens,
+        ) == (5, 10, 15, 2, 3)
 
 
 class TestTranscriptionRequest:
     """Test transcription request model."""
 
-    def test_default_values(self):
+    def test_default_values(self, default_request):
         """Test default values."""
-        request = TranscriptionRequest()
+        request = default_request
         assert request.model == "whisper-1"
         assert request.language is None
         assert request.response_format == "json"
         assert request.stream is False
 
-    def test_valid_request(self):
+    def test_valid_request(self, valid_en_request):
         """Test valid request creation."""
-        request = TranscriptionRequest(
-            model="gpt-4o-transcribe",
-            language="en",
-            response_format="json"
-        )
+        request = valid_en_request
         assert request.model == "gpt-4o-transcribe"
         assert request.language == "en"
         assert request.response_format == "json"
 
-    def test_model_validation(self):
-        """Test model validation."""
-        # Valid models should work
-        valid_models = [
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe", 
-            "parakeet-tdt-0.6b-v2",
-            "whisper-1"
-        ]
-        
-        for model in valid_models:
-            request = TranscriptionRequest(model=model)
-            assert request.model == model
-
-        # Non-standard models should be accepted but logged
+    @pytest.mark.parametrize("model_id", [
+        "gpt-4o-transcribe",
+        "gpt-4o-mini-transcribe",
+        "parakeet-tdt-0.6b-v2",
+        "whisper-1"
+    ])
+    def test_model_validation(self, model_id):
+        """Test valid models are accepted."""
+        assert TranscriptionRequest(model=model_id).model == model_id
+
+    def test_nonstandard_model_accepted(self):
+        """Test non-standard models are accepted but logged."""
         request = TranscriptionRequest(model="custom-model")
         assert request.model == "custom-model"
 
@@ -134,11 +165,10 @@ class TestTranscriptionRequest:
         
         assert "not supported" in str(exc_info.value)
 
-    def test_stream_validation(self):
+    def test_stream_validation(self, whisper_stream_request):
         """Test stream validation."""
         # Should be fine for whisper-1 and parakeet models
-        request = TranscriptionRequest(model="whisper-1", stream=True)
-        assert request.stream is True
+        assert whisper_stream_request.stream is True
 
         request = TranscriptionRequest(model="parakeet-tdt-0.6b-v2", stream=True)
         assert request.stream is True
@@ -149,19 +179,13 @@ class TestTranscriptionRequest:
         
         assert "not supported for model" in str(exc_info.value)
 
-    def test_temperature_validation(self):
-        """Test temperature validation."""
-        # Valid temperature values
-        request = TranscriptionRequest(temperature=0.0)
-        assert request.temperature == 0.0
+    @pytest.mark.parametrize("temperature", [0.0, 1.0, 0.5])
+    def test_temperature_validation(self, temperature):
+        """Test valid temperature values are accepted."""
+        assert TranscriptionRequest(temperature=temperature).temperature == temperature
 
-        request = TranscriptionRequest(temperature=1.0)
-        assert request.temperature == 1.0
-
-        request = TranscriptionRequest(temperature=0.5)
-        assert request.temperature == 0.5
-
-        # Invalid temperature values
+    def test_temperature_out_of_range(self):
+        """Test invalid temperature values are rejected."""
         with pytest.raises(ValidationError):
             TranscriptionRequest(temperature=-0.1)
 
@@ -172,9 +196,9 @@ class TestTranscriptionRequest:
 class TestTranscriptionResponse:
     """Test transcription response model."""
 
-    def test_basic_response(self):
+    def test_basic_response(self, hello_response):
         """Test basic response creation."""
-        response = TranscriptionResponse(text="Hello world")
+        response = hello_response
         assert response.text == "Hello world"
         assert response.usage.type == "tokens"
         assert response.usage.input_tokens == 1
@@ -194,10 +218,12 @@ class TestModelInfo:
     def test_model_info_creation(self):
         """Test model info creation."""
         model = ModelInfo(id="test-model")
-        assert model.id == "test-model"
-        assert model.object == "model"
-        assert model.created == 1744718400
-        assert model.owned_by == "parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license"
+        assert (model.id, model.object, model.created, model.owned_by) == (
+            "test-model",
+            "model",
+            1744718400,
+            "parakeet-tdt-0.6b-v2-released-by-nvidia-with-cc-by-40-license",
+        )
 
     def test_custom_values(self):
         """Test custom values."""
@@ -217,8 +243,8 @@ class TestModelListResponse:
     def test_model_list_creation(self):
         """Test model list creation."""
         models = [
-            ModelInfo(id="model1"),
-            ModelInfo(id="model2")
+            ModelInfo.model_construct(id="model1"),
+            ModelInfo.model_construct(id="model2")
         ]
         response = ModelListResponse(data=models)
         assert response.object == "list"
@@ -227,20 +253,30 @@ class TestModelListResponse:
         assert response.data[1].id == "model2"
 
 
+class TestRecords:
+    """Test internal fixed-value records."""
+
+    def test_fixed_usage_matches_schema(self):
+        """Test fixed usage serializes like the Pydantic TokenUsage."""
+        assert FIXED_USAGE_DICT == TokenUsage().model_dump()
+        assert FIXED_USAGE.input_token_details.audio_tokens == 1
+
+    def test_records_are_frozen_and_slotted(self):
+        """Test records cannot be mutated and carry no instance dict."""
+        model = AVAILABLE_MODELS[0]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            model.id = "other-model"
+        assert not hasattr(model, "__dict__")
+        assert not hasattr(FIXED_USAGE, "__dict__")
+
+
 class TestModelUtilities:
     """Test model utility functions."""
 
     def test_available_models(self):
         """Test available models list."""
         assert len(AVAILABLE_MODELS) == 4
-        model_ids = [model.id for model in AVAILABLE_MODELS]
-        expected_ids = [
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe",
-            "parakeet-tdt-0.6b-v2",
-            "whisper-1"
-        ]
-        assert set(model_ids) == set(expected_ids)
+        assert AVAILABLE_MODEL_IDS == _EXPECTED_MODEL_IDS
 
     def test_get_model_list(self):
         """Test get_model_list function."""
@@ -248,14 +284,18 @@ class TestModelUtilities:
         assert isinstance(model_list, ModelListResponse)
         assert model_list.object == "list"
         assert len(model_list.data) == 4
+        
+        # Built without validation, so check it round-trips through the schema
+        dumped = model_list.model_dump()
+        assert ModelListResponse.model_validate(dumped).model_dump() == dumped
 
-    def test_get_model_info_existing(self):
+    @pytest.mark.parametrize("model", AVAILABLE_MODELS, ids=lambda m: m.id)
+    def test_get_model_info_existing(self, model):
         """Test get_model_info for existing models."""
-        for model in AVAILABLE_MODELS:
-            info = get_model_info(model.id)
-            assert info is not None
-            assert info.id == model.id
-            assert info.object == "model"
+        info = get_model_info(model.id)
+        assert info is not None
+        assert info.id == model.id
+        assert info.object == "model"
 
     def test_get_model_info_nonexistent(self):
         """Test get_model_info for non-existent model."""
@@ -1,11 +1,21 @@
 """Unit tests for services."""
 
-import tempfile
+import asyncio
+import io
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+from types import SimpleNamespace
+from typing import Optional, Type
+from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
+import soundfile as sf
 
+from src.core import AudioMetadata
+from src.core.audio_processor import _read_header, parse_audio_header
+from src.core.batcher import MAX_LENGTH_RATIO, TranscriptionBatcher, _bucket_by_length
 from src.core.exceptions import (
     AudioProcessingError,
     AudioValidationError,
@@ -15,6 +25,79 @@ from src.core.exceptions import (
 from src.models import TranscriptionRequest, TranscriptionResponse
 from src.services import audio_service, model_service, transcription_service
 
+_EXPECTED_MODEL_IDS = frozenset({
+    "gpt-4o-transcribe",
+    "gpt-4o-mini-transcribe",
+    "parakeet-tdt-0.6b-v2",
+    "whisper-1",
+})
+_EXPECTED_FORMATS = frozenset({"flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "wav", "webm"})
+
+
+async def _anoop(*args, **kwargs):
+    """Awaitable stand-in that does nothing."""
+    return None
+
+
+class _AsyncRecorder:
+    """Awaitable stub that records its calls and returns a fixed value."""
+    
+    __slots__ = ("calls", "return_value")
+
+    def __init__(self, return_value=None):
+        self.calls = []
+        self.return_value = return_value
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+
+_TRANSCRIPT = "The quick brown fox jumped over the lazy dog."
+
+
+@dataclass(frozen=True, slots=True)
+class _TranscribeScenario:
+    """One transcribe_audio outcome: the request shape and what it should raise."""
+    
+    id: str
+    filename: str = "test.wav"
+    oversized: bool = False
+    loaded: bool = True
+    transcribe_error: Optional[Exception] = None
+    expected_exc: Optional[Type[Exception]] = None
+    expected_match: Optional[str] = None
+
+
+_TRANSCRIBE_SCENARIOS = (
+    _TranscribeScenario("success"),
+    _TranscribeScenario(
+        "invalid_filename",
+        filename="test.txt",
+        expected_exc=AudioValidationError,
+        expected_match="Unsupported file format",
+    ),
+    _TranscribeScenario(
+        "file_too_large",
+        oversized=True,
+        expected_exc=AudioValidationError,
+        expected_match="File too large",
+    ),
+    _TranscribeScenario("model_not_loaded", loaded=False, expected_exc=ModelNotLoadedError),
+    _TranscribeScenario(
+        "model_error",
+        transcribe_error=Exception("CUDA out of memory"),
+        expected_exc=ModelError,
+        expected_match="Transcription failed",
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def whisper_request():
+    """Shared whisper-1 request; no test mutates it."""
+    return TranscriptionRequest(model="whisper-1")
+
 
 class TestModelService:
     """Test model service."""
@@ -25,14 +108,7 @@ class TestModelService:
         
         assert result.object == "list"
         assert len(result.data) == 4
-        model_ids = [model.id for model in result.data]
-        expected_ids = [
-            "gpt-4o-transcribe",
-            "gpt-4o-mini-transcribe",
-            "parakeet-tdt-0.6b-v2",
-            "whisper-1"
-        ]
-        assert set(model_ids) == set(expected_ids)
+        assert {model.id for model in result.data} == _EXPECTED_MODEL_IDS
 
     def test_get_model_info_existing(self):
         """Test getting info for existing model."""
@@ -58,8 +134,7 @@ class TestModelService:
         """Test getting supported models list."""
         models = model_service.get_supported_models()
         assert len(models) == 4
-        assert "whisper-1" in models
-        assert "gpt-4o-transcribe" in models
+        assert set(models) == _EXPECTED_MODEL_IDS
 
     def test_get_backend_model_name(self):
         """Test getting backend model name."""
@@ -82,20 +157,11 @@ class TestModelService:
 class TestAudioService:
     """Test audio service."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def temp_file(self):
-        """Create a temporary file for testing."""
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp.write(b"fake audio content")
-            temp_path = Path(tmp.name)
-        
-        yield temp_path
-        
-        # Cleanup
-        if temp_path.exists():
-            temp_path.unlink()
+        """Return a sentinel path; every consumer mocks the audio processor."""
+        return Path("/nonexistent/fake.wav")
 
-    @pytest.mark.asyncio
     async def test_validate_and_save_file_valid(self):
         """Test validating and saving a valid file."""
         content = b"fake audio content"
@@ -109,9 +175,8 @@ class TestAudioService:
             )
             
             assert result == Path("/tmp/saved_file.wav")
-            mock_save.assert_called_once()
+            mock_save.assert_called_once_with(content, "wav")
 
-    @pytest.mark.asyncio
     async def test_validate_and_save_file_invalid_extension(self):
         """Test validating file with invalid extension."""
         content = b"fake content"
@@ -122,10 +187,9 @@ class TestAudioService:
                 content, filename, request_id="test-123"
             )
 
-    @pytest.mark.asyncio
-    async def test_validate_and_save_file_too_large(self):
+    async def test_validate_and_save_file_too_large(self, oversized_upload):
         """Test validating file that's too large."""
-        content = b"x" * (30 * 1024 * 1024)  # 30MB
+        content = oversized_upload
         filename = "test.wav"
         
         with pytest.raises(AudioValidationError, match="File too large"):
@@ -133,7 +197,6 @@ class TestAudioService:
                 content, filename, request_id="test-123"
             )
 
-    @pytest.mark.asyncio
     async def test_process_for_transcription(self, temp_file):
         """Test processing audio for transcription."""
         with patch.object(audio_service.audio_processor, 'process_audio_file') as mock_process:
@@ -147,16 +210,133 @@ class TestAudioService:
             assert needs_cleanup is False
             mock_process.assert_called_once_with(temp_file)
 
-    @pytest.mark.asyncio
+    async def test_process_compatible_wav_skips_probe(self, tmp_path):
+        """Test 16 kHz mono WAV is accepted from its header alone, read off the event loop."""
+        wav_path = tmp_path / "speech.wav"
+        sf.write(wav_path, np.zeros(1600, dtype=np.float32), 16000)
+        read_threads = []
+        
+        def read_header(path):
+            read_threads.append(threading.get_ident())
+            return _read_header(path)
+        
+        with patch.object(audio_service.audio_processor, 'get_audio_metadata') as mock_get_metadata, \
+             patch('src.core.audio_processor._read_header', side_effect=read_header):
+            result_path, needs_cleanup = await audio_service.audio_processor.process_audio_file(wav_path)
+            
+            assert result_path == wav_path
+            assert needs_cleanup is False
+            mock_get_metadata.assert_not_called()
+            assert read_threads and threading.get_ident() not in read_threads
+
+    async def test_audio_metadata_cached(self, tmp_path):
+        """Test repeated metadata requests probe the file once."""
+        wav_path = tmp_path / "speech.wav"
+        sf.write(wav_path, np.zeros(1600, dtype=np.float32), 8000)
+        processor = audio_service.audio_processor
+        
+        with patch.object(processor, '_probe_metadata', wraps=processor._probe_metadata) as mock_probe:
+            first = await audio_service.get_audio_metadata(wav_path, request_id="test-123")
+            assert await audio_service.validate_audio_content(wav_path, request_id="test-123")
+            
+            assert first.sample_rate == 8000
+            mock_probe.assert_called_once()
+            
+            # Rewriting the file invalidates the cached entry
+            sf.write(wav_path, np.zeros(3200, dtype=np.float32), 16000)
+            second = await audio_service.get_audio_metadata(wav_path, request_id="test-123")
+            assert second.sample_rate == 16000
+            assert mock_probe.call_count == 2
+
+    async def test_failed_metadata_probe_not_cached(self, tmp_path):
+        """Test a failed probe is retried instead of caching None."""
+        wav_path = tmp_path / "speech.wav"
+        sf.write(wav_path, np.zeros(1600, dtype=np.float32), 8000)
+        processor = audio_service.audio_processor
+        
+        with patch.object(processor, '_probe_metadata', return_value=None) as mock_probe:
+            assert await processor.get_audio_metadata(wav_path) is None
+            assert await processor.get_audio_metadata(wav_path) is None
+            assert mock_probe.call_count == 2
+
+    async def test_decode_stereo_in_process(self):
+        """Test 16 kHz stereo WAV is downmixed without FFmpeg."""
+        buffer = io.BytesIO()
+        stereo = np.stack([np.full(800, 0.5), np.full(800, -0.5)], axis=1)
+        sf.write(buffer, stereo, 16000, format="WAV", subtype="FLOAT")
+        
+        audio = await audio_service.audio_processor.decode_compatible_audio(buffer.getvalue(), "wav")
+        
+        assert audio.shape == (800,)
+        assert audio.dtype == np.float32
+        assert np.allclose(audio, 0.0)
+        
+        # Formats libsndfile is not used for still go through FFmpeg
+        assert await audio_service.audio_processor.decode_compatible_audio(buffer.getvalue(), "mp3") is None
+
+    async def test_decode_waits_for_decode_slot(self, monkeypatch):
+        """Test in-process decoding is bounded by the shared decode slots."""
+        buffer = io.BytesIO()
+        sf.write(buffer, np.zeros(800, dtype=np.float32), 16000, format="WAV")
+        processor = audio_service.audio_processor
+        slots = asyncio.Semaphore(1)
+        monkeypatch.setattr(processor, "_decode_slots", slots)
+        
+        await slots.acquire()
+        task = asyncio.ensure_future(processor.decode_compatible_audio(buffer.getvalue(), "wav"))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        
+        slots.release()
+        audio = await asyncio.wait_for(task, timeout=5)
+        assert audio.shape == (800,)
+
+    @pytest.mark.parametrize("sample_rate", [8000, 48000])
+    async def test_decode_resamples_in_process(self, sample_rate):
+        """Test non-16 kHz WAV is resampled to 16 kHz without FFmpeg."""
+        pytest.importorskip("scipy.signal")
+        buffer = io.BytesIO()
+        sf.write(buffer, np.zeros(sample_rate // 10, dtype=np.float32), sample_rate, format="WAV")
+        
+        audio = await audio_service.audio_processor.decode_compatible_audio(buffer.getvalue(), "wav")
+        
+        # 0.1 s of audio comes back as 0.1 s at 16 kHz
+        assert audio is not None
+        assert audio.shape == (1600,)
+        assert audio.dtype == np.float32
+
+    async def test_cleanup_temp_file_only_in_temp_dir(self, tmp_path):
+        """Test cleanup removes temp files and ignores paths elsewhere."""
+        processor = audio_service.audio_processor
+        temp_path = await processor.save_uploaded_file(b"fake audio content", "wav")
+        outside_path = tmp_path / "keep.wav"
+        outside_path.write_bytes(b"fake audio content")
+        
+        await processor.cleanup_temp_file(temp_path)
+        await processor.cleanup_temp_file(str(temp_path))  # already removed
+        await processor.cleanup_temp_file(outside_path)
+        
+        assert not temp_path.exists()
+        assert outside_path.exists()
+
+    def test_parse_audio_header(self, tmp_path):
+        """Test sample rate and channels are read from WAV and FLAC headers."""
+        for name, sample_rate, channels in [("a.wav", 16000, 1), ("b.flac", 48000, 2)]:
+            path = tmp_path / name
+            sf.write(path, np.zeros((100, channels), dtype=np.float32), sample_rate)
+            assert parse_audio_header(path.read_bytes()[:512]) == (sample_rate, channels)
+        
+        assert parse_audio_header(b"fake audio content") is None
+
     async def test_get_audio_metadata(self, temp_file):
         """Test getting audio metadata."""
-        expected_metadata = {
-            "sample_rate": 16000,
-            "channels": 1,
-            "codec_name": "pcm_s16le",
-            "duration": 1.0,
-            "bit_rate": 256000
-        }
+        expected_metadata = AudioMetadata(
+            sample_rate=16000,
+            channels=1,
+            codec_name="pcm_s16le",
+            duration=1.0,
+            bit_rate=256000,
+        )
         
         with patch.object(audio_service.audio_processor, 'get_audio_metadata') as mock_get_metadata:
             mock_get_metadata.return_value = expected_metadata
@@ -168,31 +348,30 @@ class TestAudioService:
             assert metadata == expected_metadata
             mock_get_metadata.assert_called_once_with(temp_file)
 
-    @pytest.mark.asyncio
     async def test_cleanup_file(self, temp_file):
         """Test file cleanup."""
         with patch.object(audio_service.audio_processor, 'cleanup_temp_file') as mock_cleanup:
             await audio_service.cleanup_file(temp_file, request_id="test-123")
             mock_cleanup.assert_called_once_with(temp_file)
 
-    def test_is_format_supported(self):
+    @pytest.mark.parametrize("extension, supported", [
+        ("wav", True),
+        ("mp3", True),
+        ("WAV", True),  # Case insensitive
+        ("txt", False),
+    ])
+    def test_is_format_supported(self, extension, supported):
         """Test format support checking."""
-        assert audio_service.is_format_supported("wav")
-        assert audio_service.is_format_supported("mp3")
-        assert audio_service.is_format_supported("WAV")  # Case insensitive
-        assert not audio_service.is_format_supported("txt")
+        assert audio_service.is_format_supported(extension) is supported
 
     def test_get_supported_formats(self):
         """Test getting supported formats."""
-        formats = audio_service.get_supported_formats()
-        expected_formats = {"flac", "mp3", "mp4", "mpeg", "mpga", "m4a", "ogg", "wav", "webm"}
-        assert set(formats) == expected_formats
+        assert set(audio_service.get_supported_formats()) == _EXPECTED_FORMATS
 
-    @pytest.mark.asyncio
     async def test_validate_audio_content(self, temp_file):
         """Test validating audio content."""
         with patch.object(audio_service.audio_processor, 'get_audio_metadata') as mock_get_metadata:
-            mock_get_metadata.return_value = {"sample_rate": 16000}
+            mock_get_metadata.return_value = AudioMetadata(16000, 1, "pcm_16", 1.0, 256000)
             
             result = await audio_service.validate_audio_content(
                 temp_file, request_id="test-123"
@@ -205,112 +384,79 @@ class TestAudioService:
 class TestTranscriptionService:
     """Test transcription service."""
 
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_success(self):
-        """Test successful audio transcription."""
-        content = b"fake audio content"
-        filename = "test.wav"
-        request = TranscriptionRequest(model="whisper-1")
+    @pytest.fixture(autouse=True)
+    def _loaded(self, monkeypatch):
+        """Report the model as loaded unless a test overrides it."""
+        monkeypatch.setattr(transcription_service.model_manager, "_is_loaded", True)
+
+    @pytest.fixture
+    def svc_mocks(self, monkeypatch):
+        """Mock file handling and inference on the shared transcription service."""
+        mocks = SimpleNamespace(
+            save=_AsyncRecorder(Path("/tmp/uploaded.wav")),
+            process=_AsyncRecorder((Path("/tmp/processed.wav"), True)),
+            transcribe=MagicMock(),
+            cleanup=_anoop,
+        )
+        monkeypatch.setattr(transcription_service.audio_processor, "save_uploaded_file", mocks.save)
+        monkeypatch.setattr(transcription_service.audio_processor, "process_audio_file", mocks.process)
+        monkeypatch.setattr(transcription_service.model_manager, "transcribe", mocks.transcribe)
+        monkeypatch.setattr(transcription_service, "_cleanup_files", mocks.cleanup)
+        return mocks
+
+    @pytest.mark.parametrize("scenario", _TRANSCRIBE_SCENARIOS, ids=lambda scenario: scenario.id)
+    async def test_transcribe_audio(self, scenario, whisper_request, svc_mocks, monkeypatch, oversized_upload):
+        """Test transcription outcomes for valid and rejected requests."""
+        content = oversized_upload if scenario.oversized else b"fake audio content"
+        monkeypatch.setattr(transcription_service.model_manager, "_is_loaded", scenario.loaded)
+        svc_mocks.transcribe.return_value = [_TRANSCRIPT]
+        svc_mocks.transcribe.side_effect = scenario.transcribe_error
+        call = transcription_service.transcribe_audio(
+            content, scenario.filename, whisper_request, request_id="test-123"
+        )
         
-        with patch.object(transcription_service.audio_processor, 'save_uploaded_file') as mock_save, \
-             patch.object(transcription_service.audio_processor, 'process_audio_file') as mock_process, \
-             patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe, \
-             patch.object(transcription_service, '_cleanup_files') as mock_cleanup:
-            
-            mock_save.return_value = Path("/tmp/uploaded.wav")
-            mock_process.return_value = (Path("/tmp/processed.wav"), True)
-            mock_transcribe.return_value = ["The quick brown fox jumped over the lazy dog."]
-            mock_cleanup.return_value = None
-            
-            response = await transcription_service.transcribe_audio(
-                content, filename, request, request_id="test-123"
-            )
-            
+        if scenario.expected_exc is None:
+            response = await call
             assert isinstance(response, TranscriptionResponse)
-            assert response.text == "The quick brown fox jumped over the lazy dog."
+            assert response.text == _TRANSCRIPT
             assert response.usage.input_tokens == 1
             assert response.usage.output_tokens == 1
             assert response.usage.total_tokens == 2
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_invalid_filename(self):
-        """Test transcription with invalid filename."""
-        content = b"fake content"
-        filename = "test.txt"
-        request = TranscriptionRequest(model="whisper-1")
-        
-        with pytest.raises(AudioValidationError, match="Unsupported file format"):
-            await transcription_service.transcribe_audio(
-                content, filename, request, request_id="test-123"
-            )
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_file_too_large(self):
-        """Test transcription with file too large."""
-        content = b"x" * (30 * 1024 * 1024)  # 30MB
-        filename = "test.wav"
-        request = TranscriptionRequest(model="whisper-1")
+            assert svc_mocks.process.calls == [((Path("/tmp/uploaded.wav"),), {})]
+            return
         
-        with pytest.raises(AudioValidationError, match="File too large"):
-            await transcription_service.transcribe_audio(
-                content, filename, request, request_id="test-123"
-            )
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_model_not_loaded(self):
-        """Test transcription when model is not loaded."""
-        content = b"fake audio content"
-        filename = "test.wav"
-        request = TranscriptionRequest(model="whisper-1")
+        with pytest.raises(scenario.expected_exc, match=scenario.expected_match):
+            await call
+        if scenario.transcribe_error is None:
+            svc_mocks.transcribe.assert_not_called()
+
+    async def test_transcribe_audio_in_memory(self, whisper_request, svc_mocks):
+        """Test 16 kHz mono WAV is transcribed without writing to disk."""
+        buffer = io.BytesIO()
+        sf.write(buffer, np.zeros(1600, dtype=np.float32), 16000, format="WAV")
+        svc_mocks.transcribe.return_value = ["silence"]
         
-        with patch.object(transcription_service.audio_processor, 'save_uploaded_file') as mock_save, \
-             patch.object(transcription_service.audio_processor, 'process_audio_file') as mock_process, \
-             patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=False)), \
-             patch.object(transcription_service, '_cleanup_files') as mock_cleanup:
-            
-            mock_save.return_value = Path("/tmp/uploaded.wav")
-            mock_process.return_value = (Path("/tmp/processed.wav"), True)
-            mock_cleanup.return_value = None
-            
-            with pytest.raises(ModelNotLoadedError):
-                await transcription_service.transcribe_audio(
-                    content, filename, request, request_id="test-123"
-                )
-
-    @pytest.mark.asyncio
-    async def test_transcribe_audio_model_error(self):
-        """Test transcription with model error."""
-        content = b"fake audio content"
-        filename = "test.wav"
-        request = TranscriptionRequest(model="whisper-1")
+        response = await transcription_service.transcribe_audio(
+            buffer.getvalue(), "test.wav", whisper_request, request_id="test-123"
+        )
         
-        with patch.object(transcription_service.audio_processor, 'save_uploaded_file') as mock_save, \
-             patch.object(transcription_service.audio_processor, 'process_audio_file') as mock_process, \
-             patch.object(transcription_service.model_manager.__class__, 'is_loaded', new_callable=lambda: PropertyMock(return_value=True)), \
-             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe, \
-             patch.object(transcription_service, '_cleanup_files') as mock_cleanup:
-            
-            mock_save.return_value = Path("/tmp/uploaded.wav")
-            mock_process.return_value = (Path("/tmp/processed.wav"), True)
-            mock_transcribe.side_effect = Exception("CUDA out of memory")
-            mock_cleanup.return_value = None
-            
-            with pytest.raises(ModelError, match="Transcription failed"):
-                await transcription_service.transcribe_audio(
-                    content, filename, request, request_id="test-123"
-                )
+        assert response.text == "silence"
+        assert svc_mocks.save.calls == []
+        audio = svc_mocks.transcribe.call_args.args[0][0]
+        assert isinstance(audio, np.ndarray)
+        assert audio.dtype == np.float32
 
     def test_get_supported_models(self):
         """Test getting supported models."""
         models = transcription_service.get_supported_models()
-        expected_models = [
+        expected_models = (
             "gpt-4o-transcribe",
             "gpt-4o-mini-transcribe", 
             "parakeet-tdt-0.6b-v2",
             "whisper-1"
-        ]
+        )
         assert models == expected_models
+        assert set(models) == model_service.supported_models == _EXPECTED_MODEL_IDS
 
     def test_is_model_supported(self):
         """Test model support checking."""
@@ -318,7 +464,6 @@ class TestTranscriptionService:
         assert transcription_service.is_model_supported("gpt-4o-transcribe")
         assert not transcription_service.is_model_supported("unknown-model")
 
-    @pytest.mark.asyncio
     async def test_cleanup_files(self):
         """Test file cleanup."""
         uploaded_path = Path("/tmp/uploaded.wav")
@@ -332,7 +477,25 @@ class TestTranscriptionService:
             mock_cleanup.assert_any_call(uploaded_path)
             mock_cleanup.assert_any_call(processed_path)
 
-    @pytest.mark.asyncio
+    async def test_cleanup_runs_in_background(self, whisper_request):
+        """Test temp files are removed after the response is returned."""
+        
+        with patch.object(transcription_service.audio_processor, 'save_uploaded_file') as mock_save, \
+             patch.object(transcription_service.audio_processor, 'process_audio_file') as mock_process, \
+             patch.object(transcription_service.model_manager, 'transcribe') as mock_transcribe, \
+             patch.object(transcription_service.audio_processor, 'cleanup_temp_file') as mock_cleanup:
+            
+            mock_save.return_value = Path("/tmp/uploaded.mp3")
+            mock_process.return_value = (Path("/tmp/processed.wav"), True)
+            mock_transcribe.return_value = ["hello"]
+            
+            await transcription_service.transcribe_audio(
+                b"fake audio content", "test.mp3", whisper_request, request_id="test-123"
+            )
+            await transcription_service.wait_for_cleanup()
+            
+            assert mock_cleanup.call_count == 2
+
     async def test_cleanup_files_same_path(self):
         """Test file cleanup when paths are the same."""
         file_path = Path("/tmp/file.wav")
@@ -343,4 +506,135 @@ class TestTranscriptionService:
             
             # Should only cleanup once
             assert mock_cleanup.call_count == 1
-            mock_cleanup.assert_called_with(file_path)
\ No newline at end of file
+            mock_cleanup.assert_called_with(file_path)
+
+
+class TestTranscriptionBatcher:
+    """Test dynamic batching of transcription requests."""
+
+    async def test_concurrent_requests_share_forward_pass(self):
+        """Test overlapping requests are transcribed in one model call."""
+        manager = MagicMock()
+        manager.transcribe.side_effect = lambda paths, batch_size: [f"text {p}" for p in paths]
+        batcher = TranscriptionBatcher(manager=manager, max_batch_size=4, max_wait_ms=50)
+        
+        try:
+            results = await asyncio.gather(
+                *(batcher.submit(f"/tmp/missing_{i}.wav") for i in range(3))
+            )
+        finally:
+            batcher.stop()
+        
+        assert results == [f"text /tmp/missing_{i}.wav" for i in range(3)]
+        manager.transcribe.assert_called_once()
+        assert manager.transcribe.call_args.kwargs["batch_size"] == 3
+
+    async def test_paths_and_arrays_not_mixed(self):
+        """Test file paths and decoded arrays go to separate forward passes."""
+        manager = MagicMock()
+        
+        def transcribe(inputs, batch_size):
+            kinds = {isinstance(audio, str) for audio in inputs}
+            assert len(kinds) == 1, "mixed input kinds in one forward pass"
+            return ["path text" if isinstance(audio, str) else "array text" for audio in inputs]
+        
+        manager.transcribe.side_effect = transcribe
+        batcher = TranscriptionBatcher(manager=manager, max_batch_size=4, max_wait_ms=50)
+        
+        try:
+            results = await asyncio.gather(
+                batcher.submit("/tmp/missing.wav"),
+                batcher.submit(np.zeros(0, dtype=np.float32)),
+            )
+        finally:
+            batcher.stop()
+        
+        assert results == ["path text", "array text"]
+        assert manager.transcribe.call_count == 2
+
+    async def test_batch_error_propagates(self):
+        """Test a failed forward pass fails every request in the batch."""
+        manager = MagicMock()
+        manager.transcribe.side_effect = ModelError("Transcription failed: OOM")
+        batcher = TranscriptionBatcher(manager=manager, max_batch_size=2, max_wait_ms=50)
+        
+        try:
+            results = await asyncio.gather(
+                batcher.submit("/tmp/a.wav"),
+                batcher.submit("/tmp/b.wav"),
+                return_exceptions=True,
+            )
+        finally:
+            batcher.stop()
+        
+        assert all(isinstance(r, ModelError) for r in results)
+
+    async def test_short_result_fails_unmatched_requests(self):
+        """Test a result list shorter than the batch fails the unmatched requests."""
+        manager = MagicMock()
+        manager.transcribe.return_value = ["only one"]
+        batcher = TranscriptionBatcher(manager=manager, max_batch_size=2, max_wait_ms=50)
+        
+        try:
+            results = await asyncio.gather(
+                batcher.submit("/tmp/a.wav"),
+                batcher.submit("/tmp/b.wav"),
+                return_exceptions=True,
+            )
+        finally:
+            batcher.stop()
+        
+        assert results[0] == "only one"
+        assert isinstance(results[1], ModelError)
+
+    async def test_stop_fails_pending_requests(self):
+        """Test stopping the batcher fails in-flight and queued requests."""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def transcribe(paths, batch_size):
+            started.set()
+            release.wait(5)
+            return ["late"] * len(paths)
+        
+        manager = MagicMock()
+        manager.transcribe.side_effect = transcribe
+        batcher = TranscriptionBatcher(manager=manager, max_batch_size=1, max_wait_ms=0)
+        
+        in_flight = asyncio.ensure_future(batcher.submit("/tmp/a.wav"))
+        try:
+            assert await asyncio.to_thread(started.wait, 5)
+            queued = asyncio.ensure_future(batcher.submit("/tmp/b.wav"))
+            await asyncio.sleep(0)
+            
+            batcher.stop()
+            results = await asyncio.wait_for(
+                asyncio.gather(in_flight, queued, return_exceptions=True), timeout=5
+            )
+        finally:
+            release.set()
+        
+        assert all(isinstance(r, ModelError) for r in results)
+
+    async def test_worker_error_fails_requests(self):
+        """Test an unexpected worker error fails requests instead of stranding them."""
+        batcher = TranscriptionBatcher(manager=MagicMock(), max_batch_size=1, max_wait_ms=0)
+        
+        async def broken_bucket(bucket):
+            raise RuntimeError("boom")
+        
+        batcher._run_bucket = broken_bucket
+        try:
+            with pytest.raises(ModelError, match="boom"):
+                await asyncio.wait_for(batcher.submit("/tmp/a.wav"), timeout=5)
+        finally:
+            batcher.stop()
+
+    def test_bucket_by_length(self):
+        """Test buckets split once an input exceeds MAX_LENGTH_RATIO times the shortest."""
+        assert MAX_LENGTH_RATIO == 2.0
+        batch = [(np.zeros(n, dtype=np.float32), None) for n in (1000, 100, 250, 150)]
+        
+        buckets = _bucket_by_length(batch)
+        
+        assert [[len(audio) for audio, _ in bucket] for bucket in buckets] == [[100, 150], [250], [1000]]